@@ -0,0 +1,178 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""
+Run the benchmark suite and compare it with the stored baselines.
+
+Run from the slingshot directory with:
+
+    python -m benchmarks              # time everything, report regressions
+    python -m benchmarks draw menu    # only cases whose name contains a word
+    python -m benchmarks --save       # store the results as the new baselines
+
+Every case is timed as the best of a few repeats, in microseconds per
+call. A case is a regression when it is more than --tolerance slower
+than its baseline; the exit status is 1 if there is one. Baselines only
+mean something on the machine they were recorded on, so record them
+again (--save) before comparing on another one.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from benchmarks.hotpaths import CASES
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+
+def measure(run, repeat, min_time):
+    """
+    Microseconds per call of run, the best of repeat timings.
+
+    @param min_time: seconds each timing runs for at least, run is
+                     called as often as that takes
+    """
+    timer = timeit.Timer(run)
+    # Warm up first, some cases fill caches on their first call.
+    timer.timeit(1)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    best = min([elapsed] + timer.repeat(repeat - 1, number))
+    return best / number * 1e6
+
+
+def machine():
+    parts = (platform.machine(), platform.processor(), platform.system())
+    return " ".join(part for part in parts if part)
+
+
+def load(path):
+    if not os.path.exists(path):
+        return {"results": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(path, baselines, results):
+    baselines["results"].update(
+        (name, round(time, 1)) for name, time in results.items()
+    )
+    baselines["machine"] = machine()
+    baselines["python"] = platform.python_version()
+    with open(path, "w") as f:
+        json.dump(baselines, f, indent=4, sort_keys=True)
+        f.write("\n")
+
+
+def verdict(time, baseline, tolerance):
+    if baseline is None:
+        return "new"
+    if time > baseline * (1 + tolerance):
+        return "REGRESSION"
+    if time < baseline / (1 + tolerance):
+        return "faster"
+    return "ok"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time the game's hot paths against stored baselines.",
+    )
+    parser.add_argument(
+        "names", nargs="*", help="only run cases whose name contains one of these"
+    )
+    parser.add_argument("-l", "--list", action="store_true", help="list the cases")
+    parser.add_argument(
+        "-s", "--save", action="store_true", help="store the results as baselines"
+    )
+    parser.add_argument("-b", "--baselines", default=BASELINES, metavar="FILE")
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="slowdown counted as a regression (default: %(default)s)",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=7)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.1,
+        metavar="SECONDS",
+        help="length of a single timing (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    names = [
+        name
+        for name in CASES
+        if not args.names or any(word in name for word in args.names)
+    ]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        parser.error("no case matches " + " ".join(args.names))
+
+    baselines = load(args.baselines)
+    if not args.save and baselines.get("machine", machine()) != machine():
+        print(f"warning: baselines were recorded on {baselines['machine']}")
+    width = max(len(name) for name in names)
+    print(f"{'case':<{width}} {'time':>11} {'baseline':>11} {'change':>8}")
+    results = {}
+    regressions = 0
+    for name in names:
+        run = CASES[name]()
+        time = results[name] = measure(run, args.repeat, args.min_time)
+        baseline = baselines["results"].get(name)
+        status = verdict(time, baseline, args.tolerance)
+        regressions += status == "REGRESSION"
+        if baseline is None:
+            print(f"{name:<{width}} {time:>9.1f}us {'-':>11} {'':>8} {status}")
+        else:
+            change = (time / baseline - 1) * 100
+            print(
+                f"{name:<{width}} {time:>9.1f}us {baseline:>9.1f}us"
+                f" {change:>+7.1f}% {status}"
+            )
+        sys.stdout.flush()
+
+    if args.save:
+        save(args.baselines, baselines, results)
+        print(f"saved {len(results)} baselines to {args.baselines}")
+    elif regressions:
+        print(f"{regressions} regression(s) over {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""
+Time the gravity sum for growing body counts.
+
+Compares direct summation (physics.accelerate and accelerate_many) with
+the gravity.BarnesHut tree, for a single missile and for a batch of
+explosion debris, and reports the typical error of the tree. Run from
+the slingshot directory with:
+
+    python -m benchmarks.gravity
+"""
+
+import random
+import sys
+import time
+
+import numpy
+
+from game.settings import Settings
+from game.gravity import BarnesHut
+from game import physics
+
+COUNTS = (4, 8, 16, 32, 64, 128, 256, 512)
+# Number of points for the scalar and for the batched timings
+POINTS = 200
+PARTICLES = 2000
+
+
+def random_bodies(n):
+    return [
+        physics.Body(
+            (random.uniform(0, 800), random.uniform(0, 600)),
+            random.randint(3, 10),
+            random.randint(8, 64),
+            False,
+        )
+        for _ in range(n)
+    ]
+
+
+def per_point(function, points):
+    """Microseconds per point of function(point) over points."""
+    start = time.perf_counter()
+    for p in points:
+        function(p)
+    return (time.perf_counter() - start) / len(points) * 1e6
+
+
+def per_batch(function, points, repeat=5):
+    """Milliseconds per call of function(points), best of repeat."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(points)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    random.seed(0)
+    numpy.random.seed(0)
+    theta = Settings.BARNES_HUT_THETA
+    print(f"opening angle {theta}, batches of {PARTICLES} particles")
+    print(
+        f"{'bodies':>7} {'direct':>10} {'tree':>10}"
+        f" {'direct batch':>13} {'tree batch':>11} {'build':>9} {'error':>8}"
+    )
+    for n in COUNTS:
+        bodies = random_bodies(n)
+        arrays = physics.body_arrays(bodies)
+        start = time.perf_counter()
+        tree = BarnesHut(bodies, theta)
+        build = (time.perf_counter() - start) * 1000
+
+        pos = numpy.random.uniform(0, (800, 600), (PARTICLES, 2))
+        v = numpy.zeros_like(pos)
+        points = [tuple(p) for p in pos[:POINTS].tolist()]
+        direct = per_point(lambda p: physics.accelerate(p, (0.0, 0.0), bodies), points)
+        approx = per_point(lambda p: tree.accelerate(p, (0.0, 0.0)), points)
+        direct_batch = per_batch(lambda p: physics.accelerate_many(p, v, arrays), pos)
+        approx_batch = per_batch(lambda p: tree.accelerate_many(p, v), pos)
+
+        exact = physics.accelerate_many(pos, v, arrays)
+        error = numpy.hypot(*(tree.accelerate_many(pos, v) - exact).T)
+        error = numpy.median(error / numpy.hypot(*exact.T))
+        print(
+            f"{n:>7} {direct:>8.1f}us {approx:>8.1f}us {direct_batch:>11.2f}ms"
+            f" {approx_batch:>9.2f}ms {build:>7.2f}ms {error:>8.1e}"
+        )
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""
+The cases timed by the benchmark suite.
+
+Each case is a function registered with @case that does its setup and
+returns the callable to time, so setup never counts. Cases that need
+images, fonts or a screen share one Game, created under the SDL dummy
+video driver and without the user's settings.
+"""
+
+import os
+import random
+import tempfile
+
+import numpy
+
+from game.settings import Settings
+from game import animation
+from game import layout
+from game import physics
+from benchmarks.gravity import random_bodies
+
+# name -> setup function, in the order they were registered
+CASES = {}
+
+# Body counts for Particle.update
+PLANETS = (2, 8, 64)
+# Debris for ParticleSystem.update and the explosion frame
+DEBRIS = 500
+
+_game = None
+
+
+def case(name):
+    """Register a setup function as the benchmark called name."""
+
+    def register(setup):
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+def game():
+    """The Game shared by all cases, created on first use."""
+    global _game
+    if _game is None:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+        import slingshot
+
+        random.seed(0)
+        numpy.random.seed(0)
+        # Keep ~/.slingshot/settings out of the numbers.
+        home = os.environ.get("HOME")
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["HOME"] = tmp
+            try:
+                _game = slingshot.Game()
+            finally:
+                if home is None:
+                    del os.environ["HOME"]
+                else:
+                    os.environ["HOME"] = home
+        _game.opponent = None
+        _game.game_init()
+        _game.menu = None
+        _game.started = True
+    return _game
+
+
+def free_spot(bodies, margin=20):
+    """A point on the screen well clear of all bodies."""
+    for y in range(20, 600, 20):
+        for x in range(20, 800, 20):
+            if all(
+                (x - b.pos[0]) ** 2 + (y - b.pos[1]) ** 2 > (b.radius + margin) ** 2
+                for b in bodies
+            ):
+                return (float(x), float(y))
+    raise ValueError("no free spot")
+
+
+def particle_update(n):
+    def setup():
+        from game.particle import Particle
+
+        game()
+        random.seed(n)
+        bodies = random_bodies(n)
+        pos = free_spot(bodies)
+        p = Particle(pos, 10)
+
+        def run():
+            p.pos = pos
+            p.v = (0.5, -0.5)
+            p.flight = Settings.MAX_FLIGHT
+            p.update(bodies)
+
+        return run
+
+    return setup
+
+
+for _n in PLANETS:
+    case(f"particle.update[{_n} planets]")(particle_update(_n))
+
+
+@case(f"particlesystem.update[{DEBRIS} particles]")
+def particlesystem_update():
+    from game.particle import ParticleSystem
+
+    g = game()
+    system = ParticleSystem()
+    numpy.random.seed(0)
+    system.add(free_spot(g.bodies), DEBRIS, 10)
+    state = system.pos, system.v, system.flight, system.size
+
+    def run():
+        system.pos, system.v, system.flight, system.size = state
+        system.update(g.planetsprites)
+
+    return run
+
+
+@case("physics.get_intersect[hit]")
+def get_intersect_hit():
+    def run():
+        physics.get_intersect((400.0, 300.0), 30.0, (300.0, 290.0), (420.0, 310.0))
+
+    return run
+
+
+@case("physics.get_intersect[miss]")
+def get_intersect_miss():
+    def run():
+        physics.get_intersect((400.0, 300.0), 30.0, (300.0, 200.0), (420.0, 220.0))
+
+    return run
+
+
+@case("missile.update_players")
+def missile_update_players():
+    g = game()
+    missile = g.missile
+    x, y = g.players[1].rect.center
+    players = g.players
+
+    def run():
+        # A near miss, swept against both ships
+        missile.last_pos = (x - 30.0, y - 30.0)
+        missile.pos = (x - 25.0, y - 25.0)
+        missile.update_players(players)
+
+    return run
+
+
+@case("player.hit")
+def player_hit():
+    player = game().players[1]
+    pos = player.rect.center
+
+    def run():
+        player.hit(pos)
+        player.shot = False
+
+    return run
+
+
+@case("player.change_angle")
+def player_change_angle():
+    player = game().players[1]
+
+    def run():
+        player.change_angle(1)
+        player.change_angle(-1)
+
+    return run
+
+
+@case("player.update_explosion")
+def player_update_explosion():
+    player = game().players[2]
+    rect = player.rect
+
+    def run():
+        player.e = 0
+        for _ in range(6):
+            player.update_explosion()
+        player.rect = rect
+
+    return run
+
+
+@case("player.draw_info")
+def player_draw_info():
+    g = game()
+    player = g.players[1]
+
+    def run():
+        player.change_angle(1)
+        player.draw_info(g.screen)
+        player.change_angle(-1)
+        player.draw_info(g.screen)
+
+    return run
+
+
+@case("missile.draw_status")
+def missile_draw_status():
+    g = game()
+    missile = g.missile
+    missile.launch(g.players[1])
+
+    def run():
+        missile.flight = (missile.flight + 1) % 1000
+        missile.draw_status(g.screen)
+
+    return run
+
+
+@case("menu.draw[main]")
+def menu_draw_main():
+    menu = game().main_menu
+    return menu.draw
+
+
+@case("menu.draw[settings]")
+def menu_draw_settings():
+    menu = game().settings_menu
+    return menu.draw
+
+
+@case("planet.__init__")
+def planet_init():
+    from game.planet import Planet
+
+    background = game().background
+
+    def run():
+        Planet(None, background, 1, 40.0, 1000.0, (400.0, 300.0))
+
+    return run
+
+
+@case("game.create_planets[fixed]")
+def create_planets_fixed():
+    g = game()
+    planets = [
+        (n, r, m, pos)
+        for n, r, m, pos, _ in layout.generate(Settings.MAX_PLANETS, minimum=1)
+    ]
+    return lambda: g.create_planets(planets)
+
+
+@case("game.create_planets[random]")
+def create_planets_random():
+    g = game()
+
+    def run():
+        random.seed(1)
+        g.create_planets()
+
+    return run
+
+
+def frame(prepare):
+    """Time Game.draw in the state prepare(game) leaves it in."""
+    g = game()
+
+    def run():
+        prepare(g)
+        g.draw()
+
+    return run
+
+
+def aiming(g):
+    from game.particle import ParticleSystem
+
+    g.menu = None
+    g.firing = 0
+    g.round_over = False
+    g.banner.stop()
+    g.particlesystem = ParticleSystem()
+
+
+@case("game.draw[aiming]")
+def draw_aiming():
+    return frame(aiming)
+
+
+@case("game.draw[aiming, flip]")
+def draw_aiming_flip():
+    g = game()
+
+    def run():
+        aiming(g)
+        Settings.DIRTY_RECTS = False
+        try:
+            g.draw()
+        finally:
+            Settings.DIRTY_RECTS = True
+
+    return run
+
+
+@case("game.draw[round banner]")
+def draw_banner():
+    def prepare(g):
+        aiming(g)
+        g.banner.play(animation.banner(f"Round {g.round}", 25), start=3)
+
+    return frame(prepare)
+
+
+@case("game.draw[missile]")
+def draw_missile():
+    def prepare(g):
+        aiming(g)
+        g.missile.launch(g.players[g.player])
+        g.missile.pos = free_spot(g.bodies)
+        g.missile.rect.center = g.missile.pos
+        g.firing = 1
+
+    return frame(prepare)
+
+
+@case("game.draw[zoom]")
+def draw_zoom():
+    def prepare(g):
+        aiming(g)
+        g.missile.launch(g.players[g.player])
+        g.missile.pos = (1000.0, 300.0)
+        g.firing = 1
+
+    return frame(prepare)
+
+
+@case(f"game.draw[{DEBRIS} particles]")
+def draw_particles():
+    from game.particle import ParticleSystem
+
+    g = game()
+    numpy.random.seed(0)
+    system = ParticleSystem()
+    system.add(free_spot(g.bodies), DEBRIS, 10)
+    # Spread out, as a few ticks after an explosion
+    system.pos = system.pos + numpy.random.uniform(-100, 100, system.pos.shape)
+
+    def prepare(g):
+        aiming(g)
+        g.particlesystem = system
+
+    return frame(prepare)
+
+
+@case("game.draw[menu]")
+def draw_menu():
+    def prepare(g):
+        aiming(g)
+        g.menu = g.main_menu
+
+    return frame(prepare)
@@ -0,0 +1,120 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""
+Time planet layout generation for growing planet counts.
+
+Compares game.layout.generate with the old one-candidate-at-a-time
+rejection loop (capped, since it may never finish). Run from the
+slingshot directory with:
+
+    python -m benchmarks.layout
+"""
+
+import math
+import random
+import sys
+import time
+
+from game.settings import Settings
+from game import layout
+
+COUNTS = (2, 4, 8, 12, 16, 24, 32)
+RUNS = 20
+# The old loop has no limit, we stop it after this many candidates.
+OLD_LOOP_CAP = 100000
+
+
+def draw_planet():
+    """One random (radius, mass, pos) candidate, drawn as Planet used to."""
+    mass = random.randint(8, 512)
+    r = mass ** (1.0 / 3.0) * 12.5
+    pos = (
+        random.randint(
+            Settings.PLANET_SHIP_DISTANCE + round(r),
+            800 - Settings.PLANET_SHIP_DISTANCE - round(r),
+        ),
+        random.randint(
+            Settings.PLANET_EDGE_DISTANCE + round(r),
+            600 - Settings.PLANET_EDGE_DISTANCE - round(r),
+        ),
+    )
+    return (r, mass, pos)
+
+
+def old_loop(n):
+    """The rejection loop Planet.__init__ used to run for every planet."""
+    placed = []
+    draws = 0
+    for _ in range(n):
+        positioned = False
+        while not positioned:
+            draws += 1
+            if draws > OLD_LOOP_CAP:
+                return None
+            r, mass, pos = draw_planet()
+            positioned = True
+            for pr, pm, ppos in placed:
+                d = math.sqrt((pos[0] - ppos[0]) ** 2 + (pos[1] - ppos[1]) ** 2)
+                if d < (r + pr) * 1.5 + 0.1 * (mass + pm):
+                    positioned = False
+        placed.append((r, mass, pos))
+    return placed
+
+
+def new_generator(n):
+    try:
+        return layout.generate(n)
+    except layout.LayoutError:
+        return None
+
+
+def run(generate, n):
+    """Return (mean ms, max ms, failures) over RUNS layouts of n planets."""
+    times = []
+    failures = 0
+    for i in range(RUNS):
+        random.seed(i)
+        start = time.perf_counter()
+        if generate(n) is None:
+            failures += 1
+        times.append((time.perf_counter() - start) * 1000)
+    return (sum(times) / len(times), max(times), failures)
+
+
+def main():
+    Settings.MAX_PLANETS = max(COUNTS)
+    print(
+        f"{'planets':>8} {'old mean':>10} {'old max':>10} {'old fail':>9}"
+        f" {'new mean':>10} {'new max':>10} {'new fail':>9}"
+    )
+    for n in COUNTS:
+        old = run(old_loop, n)
+        new = run(new_generator, n)
+        print(
+            f"{n:>8} {old[0]:>8.2f}ms {old[1]:>8.2f}ms {old[2]:>9}"
+            f" {new[0]:>8.2f}ms {new[1]:>8.2f}ms {new[2]:>9}"
+        )
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+
+"""
+Aiming for the computer player.
+
+Everything here is headless and only uses the physics module, so it can
+run in a worker thread while the game keeps drawing.
+"""
+
+from collections import namedtuple
+import random
+
+import numpy
+
+from game.settings import Settings
+from game import physics
+
+Level = namedtuple("Level", "angles powers rounds spread")
+Level.__doc__ = """How hard the computer player tries: the number of
+angles and powers in the coarse grid, the number of bisection rounds on
+top of that, and the standard deviation of the aiming error in degrees."""
+
+LEVELS = {
+    "easy": Level(8, 5, 1, 6.0),
+    "medium": Level(24, 8, 4, 1.5),
+    "hard": Level(48, 12, 8, 0.0),
+}
+
+Aim = namedtuple("Aim", "angle power outcome miss")
+Aim.__doc__ = "The shot the search settled on and what it expects to happen."
+
+
+def rank(outcome, miss, power, target):
+    """
+    Sort key of candidate shots, lower is better.
+
+    Hitting the target comes first, the less power the better since power
+    costs points. Then come shots by how close they got. Hitting ourselves
+    comes last.
+    """
+    hit = outcome == target
+    own = (outcome == physics.HIT_SHIP1) | (outcome == physics.HIT_SHIP2)
+    own &= ~hit
+    distance = numpy.where(numpy.isnan(miss), numpy.inf, numpy.abs(miss))
+    return numpy.where(hit, power - 1e6, numpy.where(own, numpy.inf, distance))
+
+
+def search(bodies, launch, ships, player, level, turn=None, **kwargs):
+    """
+    Find a good angle and power for player.
+
+    First a coarse grid of angles and powers is flown. Then, for every
+    angle, each pair of neighbouring powers between which the shot moves
+    across the target is bisected level.rounds times. With fixed power
+    the roles swap and neighbouring angles are bisected.
+
+    @param bodies: BodyArrays (or a list of Bodies) of the round
+    @param launch: function mapping an array of angles to launch points,
+                   like Player.get_launchpoints
+    @param ships: (ship 1, ship 2) pair of Ships
+    @param player: 1 or 2, the one who shoots
+    @type level: Level
+    @param turn: optional function mapping an array of angles to an array
+                 of the shooter's Ships turned to them, like
+                 Player.get_ships. The ship turns before it fires, so
+                 without it shots near the ship may hit or miss it where
+                 the search does not expect them to.
+    @param kwargs: passed on to physics.simulate_many
+
+    @rtype: Aim
+    """
+    target = physics.HIT_SHIP1 + 2 - player
+    rect = ships[2 - player].rect
+    center = (rect[0] + rect[2] / 2, rect[1] + rect[3] / 2)
+    bodies = physics.body_arrays(bodies)
+
+    def fly(angles, powers):
+        shooters = list(ships)
+        if turn is not None:
+            shooters[player - 1] = turn(angles)
+        result = physics.simulate_many(
+            bodies,
+            launch(angles),
+            angles,
+            powers,
+            shooters,
+            target=center,
+            **kwargs,
+        )
+        return (result.outcome, result.miss)
+
+    # A random offset, so we don't take the same shots every round.
+    angles = (numpy.arange(level.angles) + random.random()) * 360 / level.angles
+    if Settings.FIXED_POWER:
+        powers = numpy.array([float(Settings.POWER)])
+    else:
+        powers = numpy.linspace(
+            0.1 * Settings.MAXPOWER, Settings.MAXPOWER, level.powers
+        )
+    angles, powers = numpy.meshgrid(angles, powers, indexing="ij")
+    outcome, miss = fly(angles, powers)
+    candidates = [(angles.ravel(), powers.ravel(), outcome.ravel(), miss.ravel())]
+
+    # Pairs of neighbouring shots on either side of the target
+    if Settings.FIXED_POWER:
+        lo = angles[:, 0]
+        hi = numpy.roll(lo, -1)
+        hi[-1] += 360
+        miss_lo = miss[:, 0]
+        miss_hi = numpy.roll(miss_lo, -1)
+        fixed = powers[:, 0]
+    else:
+        lo = powers[:, :-1].ravel()
+        hi = powers[:, 1:].ravel()
+        miss_lo = miss[:, :-1].ravel()
+        miss_hi = miss[:, 1:].ravel()
+        fixed = angles[:, :-1].ravel()
+    across = numpy.sign(miss_lo) * numpy.sign(miss_hi) < 0
+    lo = lo[across]
+    hi = hi[across]
+    sign_lo = numpy.sign(miss_lo[across])
+    fixed = fixed[across]
+
+    for _ in range(level.rounds):
+        if not len(lo):
+            break
+        mid = (lo + hi) / 2
+        if Settings.FIXED_POWER:
+            angles, powers = mid % 360, fixed
+        else:
+            angles, powers = fixed, mid
+        outcome, miss = fly(angles, powers)
+        candidates.append((angles, powers, outcome, miss))
+        below = numpy.sign(miss) == sign_lo
+        lo = numpy.where(below, mid, lo)
+        hi = numpy.where(below, hi, mid)
+
+    angles, powers, outcome, miss = (numpy.concatenate(c) for c in zip(*candidates))
+    best = int(numpy.argmin(rank(outcome, miss, powers, target)))
+    aim = Aim(float(angles[best]), float(powers[best]), outcome[best], miss[best])
+    if level.spread:
+        # Miss on purpose, but not by shooting ourselves.
+        angle = (aim.angle + random.gauss(0, level.spread)) % 360
+        outcome, miss = fly(numpy.array([angle]), numpy.array([aim.power]))
+        if outcome[0] != physics.HIT_SHIP1 + player - 1:
+            aim = Aim(angle, aim.power, outcome[0], miss[0])
+    return Aim(aim.angle % 360, aim.power, int(aim.outcome), float(aim.miss))
@@ -0,0 +1,142 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+
+"""
+Animations as sequences of frames, made once and played back by index.
+"""
+
+from functools import lru_cache
+
+import pygame
+
+from game.settings import *
+from game.general import *
+
+
+class Frames:
+    """
+    The frames of an animation.
+
+    Frame i is made by make(i) the first time it is needed and kept from
+    then on, so an animation costs its full price only once.
+    """
+
+    def __init__(self, count, make):
+        self.make = make
+        self.frames = [None] * count
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, i):
+        frame = self.frames[i]
+        if frame is None:
+            frame = self.frames[i] = self.make(i)
+        return frame
+
+
+class Animation:
+    """
+    Plays Frames back, one frame per call to next().
+    """
+
+    def __init__(self):
+        self.frames = ()
+        self.index = 0
+
+    def play(self, frames, start=0):
+        """Play frames from frame number start on."""
+        self.frames = frames
+        self.index = start
+
+    def stop(self):
+        self.index = len(self.frames)
+
+    def playing(self):
+        return self.index < len(self.frames)
+
+    def next(self):
+        frame = self.frames[self.index]
+        self.index += 1
+        return frame
+
+
+@lru_cache(maxsize=None)
+def image(name):
+    """The image in data file name, with black transparent, loaded once."""
+    return load_image(name, (0, 0, 0))[0]
+
+
+@lru_cache(maxsize=None)
+def scaled(name, sizes):
+    """
+    The image in data file name scaled to each of sizes, for sprites that
+    grow or shrink the same way every time.
+
+    @param sizes: tuple of (width, height)
+    @return: Frames, shared by everyone asking for the same sizes
+    """
+    source = image(name)
+    return Frames(len(sizes), lambda i: pygame.transform.scale(source, sizes[i]))
+
+
+def fade(start=100, end=30, decay=1.04):
+    """The steps of a banner, from start down to end."""
+    steps = []
+    step = start
+    while step > end:
+        steps.append(step)
+        step /= decay
+    return steps
+
+
+@lru_cache(maxsize=2)
+def banner(text, rate):
+    """
+    Text in Settings.round_font that grows out of the centre of the
+    screen while it fades away.
+
+    @param rate: at step s of fade(), the text is (100 - s) / rate times
+                 its own height
+    @return: Frames of (surface, position), cropped to the screen
+    """
+    txt = Settings.round_font.render(text, 1, (255, 255, 255))
+    base = pygame.Surface(txt.get_size())
+    base = base.convert_alpha()
+    base.blit(txt, (0, 0))
+    base = base.convert()
+    base.set_colorkey((0, 0, 0))
+    base = base.convert_alpha()
+    w, h = base.get_size()
+    steps = fade()
+
+    def make(i):
+        s = (100 - steps[i]) * h / rate
+        frame = pygame.transform.scale(base, (int(w / h * s), int(s)))
+        rect = frame.get_rect()
+        rect.center = (399, 299)
+        visible = rect.clip(pygame.Rect(0, 0, 800, 600))
+        frame = frame.subsurface(visible.move(-rect.x, -rect.y)).copy()
+        frame.set_alpha(2 * steps[i] - 60)
+        return frame, visible.topleft
+
+    return Frames(len(steps), make)
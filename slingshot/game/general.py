@@ -22,12 +22,12 @@
 # Copyright (C) 2009 Marcus Dreier <m-rei@gmx.net>
 # Copyright (C) 2010 Ryan Kavanagh <ryanakca@kubuntu.org>
 
-from math import sqrt
 import os.path
 import pygame
 
 from pygame.locals import *
 from game.settings import Settings
+from game.physics import get_intersect
 
 
 def load_image(name, colorkey=None):
@@ -45,32 +45,6 @@ def load_image(name, colorkey=None):
     return image, image.get_rect()
 
 
-def get_intersect(center, r, pos1, pos2):
-    dx = pos2[0] - pos1[0]
-    dy = pos2[1] - pos1[1]
-    px = pos1[0]
-    py = pos1[1]
-    cx = center[0]
-    cy = center[1]
-    a = dx**2 + dy**2
-    b = 2 * (dx * px - dx * cx + dy * py - dy * cy)
-    c = -2 * cx * px - 2 * cy * py + px**2 + py**2 + cx**2 + cy**2 - r**2
-    D = b**2 - 4 * a * c
-    # print(center, r)
-    # print(pos1, pos2)
-    # print(dx, dy)
-    # print(a, b, c, D)
-    if D < 0:
-        return (4000.0, 3000.0)
-    alpha = (-b + sqrt(D)) / (2 * a)
-    if alpha > 1:
-        alpha = (-b - sqrt(D)) / (2 * a)
-    alpha = alpha - 0.05
-    pos = (px + alpha * dx, py + alpha * dy)
-    # print(pos)
-    return pos
-
-
 def get_data_path(file):
     return os.path.join(Settings.DATA_PATH, file)
 
@@ -0,0 +1,332 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""
+Faster ways of summing up the gravity of all bodies.
+
+These plug into the physics through the field argument of step(),
+step_many(), simulate() and simulate_many().
+"""
+
+import math
+
+import numpy
+
+from game.settings import Settings
+from game import physics
+
+
+class GravityField:
+    """
+    A per-round lookup table of the acceleration caused by all bodies.
+
+    Planets don't move during a round, so the acceleration is sampled once
+    on a grid covering physics.RANGE_RECT and bilinearly interpolated
+    afterwards. Bilinear interpolation is off by about h^2 / 8 times the
+    second derivative of the acceleration, which for a body of mass m is
+    about 6 * g * m / r^4. Grid cells closer than the distance at which
+    that exceeds the error bound (and anything near a planet surface or
+    black hole) fall back to the exact sum.
+    """
+
+    def __init__(self, bodies, resolution=None, error=None):
+        """
+        @param bodies: list of Bodies or Planets
+        @param resolution: grid spacing in pixels
+        @type resolution: float
+        @param error: bound on the interpolation error, in pixels/tick^2
+        @type error: float
+        """
+        if resolution is None:
+            resolution = Settings.GRAVITY_FIELD_RESOLUTION
+        if error is None:
+            error = Settings.GRAVITY_FIELD_ERROR
+        self.bodies = physics.as_bodies(bodies)
+        self.arrays = physics.body_arrays(self.bodies)
+        self.h = float(resolution)
+
+        left, top, w, h = physics.RANGE_RECT
+        self.origin = (float(left), float(top))
+        self.nx = int(math.ceil(w / self.h))
+        self.ny = int(math.ceil(h / self.h))
+
+        xs = left + self.h * numpy.arange(self.nx + 1)
+        ys = top + self.h * numpy.arange(self.ny + 1)
+        self.ax = numpy.zeros((self.ny + 1, self.nx + 1))
+        self.ay = numpy.zeros((self.ny + 1, self.nx + 1))
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            for b in self.bodies:
+                dx = xs[numpy.newaxis, :] - b.pos[0]
+                dy = ys[:, numpy.newaxis] - b.pos[1]
+                d = dx * dx + dy * dy
+                f = Settings.g * b.mass / (d * numpy.sqrt(d))
+                # Points right on a body are always evaluated exactly.
+                f[d == 0] = 0
+                self.ax += f * dx
+                self.ay += f * dy
+
+        # Every body gets its share of the error bound.
+        share = error / max(len(self.bodies), 1)
+        cx = left + self.h * (numpy.arange(self.nx) + 0.5)
+        cy = top + self.h * (numpy.arange(self.ny) + 0.5)
+        self.exact = numpy.zeros((self.ny, self.nx), dtype=bool)
+        for b in self.bodies:
+            reach = (6 * Settings.g * b.mass * self.h**2 / (8 * share)) ** 0.25
+            reach = max(reach, b.radius + 2 * self.h)
+            if b.blackhole:
+                reach = max(reach, math.sqrt(b.mass) + 2 * self.h)
+            reach += self.h * math.sqrt(2) / 2
+            dx = cx[numpy.newaxis, :] - b.pos[0]
+            dy = cy[:, numpy.newaxis] - b.pos[1]
+            self.exact |= dx**2 + dy**2 <= reach**2
+
+    def coverage(self):
+        """Fraction of the grid that is interpolated rather than exact."""
+        return 1.0 - self.exact.mean()
+
+    def accelerate(self, pos, v):
+        """Like physics.accelerate, but looked up in the table."""
+        fx = (pos[0] - self.origin[0]) / self.h
+        fy = (pos[1] - self.origin[1]) / self.h
+        if not (0 <= fx < self.nx and 0 <= fy < self.ny):
+            return physics.accelerate(pos, v, self.bodies)
+        i = int(fx)
+        j = int(fy)
+        if self.exact[j, i]:
+            return physics.accelerate(pos, v, self.bodies)
+        tx = fx - i
+        ty = fy - j
+        ax = self.ax
+        ay = self.ay
+        a0 = (1 - tx) * ax[j, i] + tx * ax[j, i + 1]
+        a1 = (1 - tx) * ax[j + 1, i] + tx * ax[j + 1, i + 1]
+        b0 = (1 - tx) * ay[j, i] + tx * ay[j, i + 1]
+        b1 = (1 - tx) * ay[j + 1, i] + tx * ay[j + 1, i + 1]
+        return (
+            v[0] - float((1 - ty) * a0 + ty * a1),
+            v[1] - float((1 - ty) * b0 + ty * b1),
+        )
+
+    def accelerate_many(self, pos, v):
+        """Like physics.accelerate_many, but looked up in the table."""
+        fx = (pos[:, 0] - self.origin[0]) / self.h
+        fy = (pos[:, 1] - self.origin[1]) / self.h
+        with numpy.errstate(invalid="ignore"):
+            inside = (0 <= fx) & (fx < self.nx) & (0 <= fy) & (fy < self.ny)
+        i = numpy.zeros(len(pos), dtype=int)
+        j = numpy.zeros(len(pos), dtype=int)
+        i[inside] = fx[inside]
+        j[inside] = fy[inside]
+        lookup = inside & ~self.exact[j, i]
+
+        result = v.copy()
+        exact = ~lookup
+        if exact.any():
+            result[exact] = physics.accelerate_many(pos[exact], v[exact], self.arrays)
+        i = i[lookup]
+        j = j[lookup]
+        tx = fx[lookup] - i
+        ty = fy[lookup] - j
+        for k, a in enumerate((self.ax, self.ay)):
+            a0 = (1 - tx) * a[j, i] + tx * a[j, i + 1]
+            a1 = (1 - tx) * a[j + 1, i] + tx * a[j + 1, i + 1]
+            result[lookup, k] -= (1 - ty) * a0 + ty * a1
+        return result
+
+
+class BarnesHut:
+    """
+    A quadtree over the bodies that sums up far away groups as one mass.
+
+    A node is used as a whole when its side s seen from the point is
+    smaller than the opening angle theta, i.e. s < theta * d with d the
+    distance to its centre of mass, and the point is outside its box.
+    Otherwise its children are looked at instead. theta = 0 is the direct
+    sum (in a different order), larger values trade accuracy for speed.
+    """
+
+    # Stop splitting here, bodies this close are lumped into one leaf.
+    MAX_DEPTH = 24
+
+    def __init__(self, bodies, theta=None):
+        """
+        @param bodies: list of Bodies or Planets
+        @param theta: opening angle
+        @type theta: float
+        """
+        if theta is None:
+            theta = Settings.BARNES_HUT_THETA
+        self.bodies = physics.as_bodies(bodies)
+        self.theta = theta
+
+        # Nodes are stored flat, the children of node k are the nodes
+        # first[k] to first[k] + count[k] - 1.
+        x0 = []
+        y0 = []
+        size = []
+        cx = []
+        cy = []
+        mass = []
+        first = []
+        count = []
+        if self.bodies:
+            xs = [b.pos[0] for b in self.bodies]
+            ys = [b.pos[1] for b in self.bodies]
+            side = max(max(xs) - min(xs), max(ys) - min(ys), 1.0)
+            queue = [(min(xs), min(ys), side, self.bodies, 0)]
+        else:
+            queue = []
+        head = 0
+        while head < len(queue):
+            left, top, side, members, depth = queue[head]
+            head += 1
+            m = sum(b.mass for b in members)
+            x0.append(left)
+            y0.append(top)
+            size.append(side)
+            cx.append(sum(b.mass * b.pos[0] for b in members) / m)
+            cy.append(sum(b.mass * b.pos[1] for b in members) / m)
+            mass.append(m)
+            first.append(len(queue))
+            if len(members) == 1 or depth == self.MAX_DEPTH:
+                count.append(0)
+                continue
+            half = side / 2
+            quadrants = ([], [], [], [])
+            for b in members:
+                east = b.pos[0] >= left + half
+                south = b.pos[1] >= top + half
+                quadrants[east + 2 * south].append(b)
+            n = 0
+            for k, quadrant in enumerate(quadrants):
+                if quadrant:
+                    queue.append(
+                        (
+                            left + half * (k % 2),
+                            top + half * (k // 2),
+                            half,
+                            quadrant,
+                            depth + 1,
+                        )
+                    )
+                    n += 1
+            count.append(n)
+
+        self.x0 = numpy.array(x0)
+        self.y0 = numpy.array(y0)
+        self.size = numpy.array(size)
+        self.cx = numpy.array(cx)
+        self.cy = numpy.array(cy)
+        self.mass = numpy.array(mass)
+        self.first = numpy.array(first, dtype=int)
+        self.count = numpy.array(count, dtype=int)
+        self.nodes = list(zip(x0, y0, size, cx, cy, mass, first, count))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def accelerate(self, pos, v):
+        """Like physics.accelerate, but summing far groups as one."""
+        vx, vy = v
+        stack = [0] if self.nodes else []
+        while stack:
+            left, top, side, cx, cy, m, first, count = self.nodes[stack.pop()]
+            dx = pos[0] - cx
+            dy = pos[1] - cy
+            d = dx**2 + dy**2
+            inside = left <= pos[0] <= left + side and top <= pos[1] <= top + side
+            if count and (inside or side * side >= self.theta**2 * d):
+                stack.extend(range(first, first + count))
+                continue
+            try:
+                vx -= (Settings.g * m * dx) / (d * math.sqrt(d))
+                vy -= (Settings.g * m * dy) / (d * math.sqrt(d))
+            except ZeroDivisionError:
+                # Same as physics.accelerate
+                vx -= 10000
+                vy -= 10000
+        return (vx, vy)
+
+    def accelerate_many(self, pos, v):
+        """
+        accelerate() for arrays of positions and velocities.
+
+        The tree is walked level by level for all points at once, as a
+        list of (point, node) pairs still to be looked at.
+        """
+        result = v.copy()
+        if not self.nodes:
+            return result
+        point = numpy.arange(len(pos))
+        node = numpy.zeros(len(pos), dtype=int)
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            while len(point):
+                px = pos[point, 0]
+                py = pos[point, 1]
+                dx = px - self.cx[node]
+                dy = py - self.cy[node]
+                d = dx * dx + dy * dy
+                left = self.x0[node]
+                top = self.y0[node]
+                side = self.size[node]
+                inside = (
+                    (left <= px)
+                    & (px <= left + side)
+                    & (top <= py)
+                    & (py <= top + side)
+                )
+                n = self.count[node]
+                opened = (n > 0) & (inside | (side * side >= self.theta**2 * d))
+
+                used = ~opened
+                f = Settings.g * self.mass[node[used]] / (d[used] * numpy.sqrt(d[used]))
+                ax = f * dx[used]
+                ay = f * dy[used]
+                zero = d[used] == 0
+                ax[zero] = 10000
+                ay[zero] = 10000
+                result[:, 0] -= numpy.bincount(point[used], ax, len(pos))
+                result[:, 1] -= numpy.bincount(point[used], ay, len(pos))
+
+                # Replace every opened pair by one pair per child.
+                n = n[opened]
+                parent = numpy.repeat(numpy.arange(len(n)), n)
+                offset = numpy.arange(len(parent)) - numpy.repeat(
+                    numpy.cumsum(n) - n, n
+                )
+                point = point[opened][parent]
+                node = self.first[node[opened]][parent] + offset
+        return result
+
+
+def field_for(bodies):
+    """
+    The field the game should use for bodies, or None for the direct sum.
+
+    That is the lookup table if Settings.GRAVITY_FIELD is on, otherwise a
+    BarnesHut tree once there are at least Settings.BARNES_HUT_BODIES.
+    """
+    if Settings.GRAVITY_FIELD:
+        return GravityField(bodies)
+    threshold = Settings.BARNES_HUT_BODIES
+    if threshold and len(bodies) >= threshold:
+        return BarnesHut(bodies)
+    return None
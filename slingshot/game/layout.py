@@ -0,0 +1,236 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""
+Random planet and black hole layouts.
+
+Bodies are placed on a grid of CELL pixel cells. For each cell we work
+out how much room is left around it, and from that which masses fit
+there, in one pass over the grid. Nothing is drawn and thrown away, so a
+crowded layout costs the same as an empty one, and a layout that does
+not fit fails with LayoutError instead of spinning forever.
+"""
+
+from random import choice, randint, random, sample
+
+import numpy
+
+from game.settings import Settings
+
+# Cells are centred on CELL_X, CELL_Y and a body goes to one of the CELL
+# by CELL pixels of its cell, at most HALF_CELL pixels from the centre
+# either way, so a cell only counts as free when its whole area is.
+CELL = 8
+HALF_CELL = CELL // 2
+CELL_X = numpy.arange(0, 801, CELL, dtype=float)
+CELL_Y = numpy.arange(0, 601, CELL, dtype=float)
+
+# Planet textures are planet_1.png to planet_8.png.
+TEXTURES = 8
+
+
+class LayoutError(Exception):
+    """Raised when no room is left for another body."""
+
+
+def texture(n):
+    """Texture number of planet number n."""
+    return (n - 1) % TEXTURES + 1
+
+
+def kind(blackhole):
+    """
+    What a body may be like.
+
+    @return: (masses, radii, x margin, y margin), masses and radii being
+             arrays of every mass the body may have, lightest first, and
+             the radius that goes with it
+    """
+    if blackhole:
+        # We can't accurately represent blackholes in this game. According
+        # to my (feeble) understanding of the Schwarzschild radius, to
+        # have a radius of 1m and be a black hole, we'd have to have a
+        # mass of 6.73*10^26kg. At least 600 is still 6 times larger than
+        # the size of our largest planet.
+        masses = numpy.arange(600, 701)
+        radii = numpy.ones(len(masses))
+        # Slightly more distance from the sides than planets because of
+        # our massive gravit. field.
+        return (
+            masses,
+            radii,
+            3 * Settings.PLANET_SHIP_DISTANCE,
+            3 * Settings.PLANET_EDGE_DISTANCE,
+        )
+    masses = numpy.arange(8, 513)
+    # radius is between 25 and 100 when mass is
+    # between 8 and 512
+    radii = masses ** (1.0 / 3.0) * 12.5
+    return (
+        masses,
+        radii,
+        Settings.PLANET_SHIP_DISTANCE,
+        Settings.PLANET_EDGE_DISTANCE,
+    )
+
+
+def clearance(placed):
+    """
+    Room left around every cell.
+
+    @param placed: (radius, mass, pos) of the bodies placed so far
+
+    @return: array of shape (len(CELL_Y), len(CELL_X)); a body of radius
+             r and mass m fits anywhere in a cell whose value is at least
+             1.5 * r + 0.1 * m
+    """
+    room = numpy.full((len(CELL_Y), len(CELL_X)), numpy.inf)
+    margin = HALF_CELL * numpy.sqrt(2)
+    for r, m, pos in placed:
+        d = numpy.hypot(
+            CELL_X[numpy.newaxis, :] - pos[0], CELL_Y[:, numpy.newaxis] - pos[1]
+        )
+        numpy.minimum(room, d - (1.5 * r + 0.1 * m + margin), out=room)
+    return room
+
+
+def edges(xmargin, ymargin):
+    """Distance of every cell from the border of the area bodies go in."""
+    x = numpy.minimum(CELL_X - xmargin, 800 - xmargin - CELL_X)
+    y = numpy.minimum(CELL_Y - ymargin, 600 - ymargin - CELL_Y)
+    return numpy.minimum(y[:, numpy.newaxis], x[numpy.newaxis, :]) - HALF_CELL
+
+
+def place(placed, blackhole=False):
+    """
+    Find room for a new body.
+
+    The spacing rule is the one the game has always used: the distance
+    between two bodies is at least 1.5 times the sum of their radii plus
+    a tenth of the sum of their masses. Heavier bodies need more room, so
+    each cell takes the lightest masses up to some heaviest one.
+
+    The old loop drew a mass, then a position in a box that shrinks as
+    the radius grows, until the pair fitted. So a pair came up in
+    proportion to one over the number of positions in its box, and the
+    (cell, mass) pairs that fit are weighted the same way. That is the
+    old distribution up to the cells: room that does not take a whole
+    cell is left unused.
+
+    @param placed: (radius, mass, pos) of the bodies placed so far
+    @param blackhole: place a black hole rather than a planet
+
+    @return: (radius, mass, pos)
+    @raise LayoutError: if not even the lightest body fits
+    """
+    masses, radii, xmargin, ymargin = kind(blackhole)
+    # Number of masses that fit in every cell.
+    fit = numpy.minimum(
+        numpy.searchsorted(1.5 * radii + 0.1 * masses, clearance(placed), "right"),
+        numpy.searchsorted(numpy.round(radii), edges(xmargin, ymargin), "right"),
+    ).ravel()
+    # weight[k] is the weight of a cell that takes the first k masses.
+    width = 800 - 2 * xmargin - 2 * numpy.round(radii) + 1
+    height = 600 - 2 * ymargin - 2 * numpy.round(radii) + 1
+    weight = numpy.concatenate(([0.0], numpy.cumsum(1 / (width * height))))
+    cells = numpy.cumsum(weight[fit])
+    if cells[-1] == 0:
+        raise LayoutError(f"no room for body {len(placed) + 1}")
+    cell = int(numpy.searchsorted(cells, random() * cells[-1], "right"))
+    i = int(numpy.searchsorted(weight, random() * weight[fit[cell]], "right")) - 1
+    y, x = divmod(cell, len(CELL_X))
+    pos = (
+        int(CELL_X[x]) + randint(-HALF_CELL, CELL - HALF_CELL - 1),
+        int(CELL_Y[y]) + randint(-HALF_CELL, CELL - HALF_CELL - 1),
+    )
+    return (radii[i].item(), int(masses[i]), pos)
+
+
+def free_number(taken, first, last):
+    """A random number from first to last that is not taken."""
+    choices = [i for i in range(first, last + 1) if i not in taken]
+    if not choices:
+        raise LayoutError(f"no free number from {first} to {last}")
+    return choice(choices)
+
+
+def numbers(count, first, last):
+    """count distinct numbers from first to last (repeating if too few)."""
+    choices = list(range(first, last + 1))
+    result = []
+    while count > 0:
+        k = min(count, len(choices))
+        result += sample(choices, k)
+        count -= k
+    return result
+
+
+def generate(n_planets, n_blackholes=0, minimum=None):
+    """
+    Generate a random layout.
+
+    @param minimum: fewest bodies that make a layout; bodies after that
+                    which do not fit are left out. Default: all of them.
+
+    @return: list of (n, radius, mass, pos, blackhole)
+    @raise LayoutError: if fewer than minimum bodies fit
+    """
+    total = n_planets + n_blackholes
+    if minimum is None:
+        minimum = total
+    kinds = [True] * n_blackholes + [False] * n_planets
+    planet_numbers = numbers(n_planets, 1, max(TEXTURES, n_planets))
+    blackhole_numbers = numbers(
+        n_blackholes,
+        Settings.MAX_PLANETS + 1,
+        Settings.MAX_PLANETS + Settings.MAX_BLACKHOLES + 1,
+    )
+
+    placed = []
+    result = []
+    for blackhole in kinds:
+        try:
+            r, mass, pos = place(placed, blackhole)
+        except LayoutError:
+            if len(result) < minimum:
+                raise
+            break
+        placed.append((r, mass, pos))
+        if blackhole:
+            n = blackhole_numbers.pop()
+        else:
+            n = planet_numbers.pop()
+        result.append((n, r, mass, pos, blackhole))
+    return result
+
+
+def generate_round():
+    """
+    The layout of a new round, with the body counts Game has always used.
+
+    @return: list of (n, radius, mass, pos, blackhole), see generate()
+    """
+    if Settings.MAX_BLACKHOLES > 0:
+        n = randint(1, Settings.MAX_BLACKHOLES)
+        return generate(0, n, minimum=1)
+    # Only have planets if we don't have any blackholes.
+    n = randint(2, Settings.MAX_PLANETS)
+    return generate(n, minimum=2)
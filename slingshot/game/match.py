@@ -0,0 +1,230 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+
+"""
+Slingshot without a window.
+
+Match plays the rounds of Game (round_init, fire, update and end_round)
+on the headless physics and scores them the same way. Shots are picked
+by shooters, functions of the match and the player to move, which makes
+it a test bed for computer players and the engine of tournament.py.
+
+Ships are their unrotated 40x33 boxes, the pixel masks of the rotated
+images need pygame.
+"""
+
+from collections import namedtuple
+from random import randint
+
+import numpy
+
+from game.settings import Settings
+from game import ai
+from game import layout
+from game import physics
+from game.gravity import field_for
+from game.spatial import BodyGrid
+
+# Size of a ship, see Player.init
+SHIP_SIZE = (40, 33)
+
+RoundResult = namedtuple("RoundResult", "winner self_hit shots scores")
+RoundResult.__doc__ = """Who won a round (0 if nobody hit anything within
+the shot limit), whether the loser shot themselves, the number of shots
+fired and the (player 1, player 2) points it earned."""
+
+
+def quick_bonus(attempts):
+    """Bonus for hitting the opponent with one of the first three shots."""
+    if attempts == 1:
+        return Settings.QUICKSCORE1
+    elif attempts == 2:
+        return Settings.QUICKSCORE2
+    elif attempts == 3:
+        return Settings.QUICKSCORE3
+    else:
+        return 0
+
+
+def ai_shooter(level):
+    """A shooter that aims with ai.search() at the given level."""
+
+    def shoot(match, player):
+        aim = ai.search(
+            match.body_arrays,
+            lambda angles: match.get_launchpoints(player, angles),
+            match.get_ships(),
+            player,
+            ai.LEVELS[level],
+            field=match.gravity_field,
+            index=match.body_grid,
+        )
+        return (aim.angle, aim.power)
+
+    return shoot
+
+
+class Match:
+    """A game between two shooters, round by round."""
+
+    def __init__(self, shooter1, shooter2, max_shots=None):
+        """
+        @param shooter1: function (match, player) -> (angle, power)
+                         picking the shots of player 1
+        @param shooter2: the same for player 2
+        @param max_shots: shots after which a round counts as a draw,
+                          default Settings.MATCH_MAX_SHOTS
+        """
+        if max_shots is None:
+            max_shots = Settings.MATCH_MAX_SHOTS
+        self.shooters = (None, shooter1, shooter2)
+        # Shooters that repeat a shot get it from here
+        self.trajectories = physics.TrajectoryCache()
+        self.max_shots = max_shots
+        self.new_game()
+
+    def new_game(self):
+        self.player = randint(1, 2)
+        self.round = 0
+        self.score = [0, 0, 0]
+
+    def round_init(self):
+        """Place the ships and bodies for the next round, see Game.round_init."""
+        self.ships = [None, None, None]
+        w, h = SHIP_SIZE
+        # Player 1 has its middle left at (20, y), player 2 its middle
+        # right at (780, y).
+        y = randint(100, 500)
+        self.ships[1] = (20, y - h // 2, w, h)
+        y = randint(100, 500)
+        self.ships[2] = (780 - w, y - h // 2, w, h)
+        self.attempts = [0, 0, 0]
+
+        self.bodies = [
+            physics.Body(pos, radius, mass, blackhole)
+            for _, radius, mass, pos, blackhole in layout.generate_round()
+        ]
+        self.body_arrays = physics.body_arrays(self.bodies)
+        self.body_grid = BodyGrid(self.bodies)
+        self.gravity_field = field_for(self.bodies)
+        self.trajectories.set_layout(self.bodies)
+
+        self.round += 1
+        if self.score[1] < self.score[2]:
+            self.player = 1
+        elif self.score[2] < self.score[1]:
+            self.player = 2
+
+    def get_ships(self):
+        """The (ship 1, ship 2) pair of physics.Ships."""
+        return (physics.Ship(self.ships[1], None), physics.Ship(self.ships[2], None))
+
+    def get_gun(self, player):
+        """The ship center and gun length, as Player.init sets them up."""
+        left, top, w, h = self.ships[player]
+        if player == 1:
+            d = w - w // 2 + 2
+        else:
+            d = w // 2 + 3
+        return ((left + w // 2, top + h // 2), d)
+
+    def get_launchpoint(self, player, angle):
+        """See Player.get_launchpoint."""
+        center, d = self.get_gun(player)
+        if Settings.ROTATE:
+            return physics.launch_point(center, d, angle)
+        left, top, w, h = self.ships[player]
+        if player == 1:
+            return (left + w + 1, center[1])
+        return (left - 1, center[1])
+
+    def get_launchpoints(self, player, angles):
+        """See Player.get_launchpoints."""
+        if Settings.ROTATE:
+            center, d = self.get_gun(player)
+            return physics.launch_point_many(center, d, angles)
+        return numpy.broadcast_to(
+            self.get_launchpoint(player, 0), numpy.shape(angles) + (2,)
+        )
+
+    def fire(self, angle, power):
+        """
+        Fire a shot for the player to move and fly it, see Game.fire.
+
+        @return: the physics outcome of the shot
+        """
+        if Settings.FIXED_POWER:
+            power = Settings.POWER
+        power = min(max(power, 0), Settings.MAXPOWER)
+        self.attempts[self.player] += 1
+        self.last = self.player
+        self.power = power
+        outcome, _, _, _ = self.trajectories.simulate(
+            self.get_launchpoint(self.player, angle),
+            angle,
+            power,
+            self.bodies,
+            ships=self.get_ships(),
+            field=self.gravity_field,
+            index=self.body_grid,
+        )
+        self.player = 3 - self.last
+        return outcome
+
+    def end_round(self, hit):
+        """
+        Score a round in which player hit was shot, see Game.end_round.
+
+        @rtype: RoundResult
+        """
+        scores = [0, 0, 0]
+        if hit == self.last:
+            scores[hit] = -Settings.SELFHIT
+            winner = 3 - hit
+            self_hit = True
+        else:
+            power_penalty = -Settings.PENALTY_FACTOR * self.power
+            bonus = quick_bonus(self.attempts[self.last])
+            scores[self.last] = power_penalty + bonus + Settings.HITSCORE
+            winner = self.last
+            self_hit = False
+        for i in (1, 2):
+            self.score[i] += scores[i]
+        shots = self.attempts[1] + self.attempts[2]
+        return RoundResult(winner, self_hit, shots, (scores[1], scores[2]))
+
+    def play_round(self):
+        """Play one round to the end. @rtype: RoundResult"""
+        self.round_init()
+        for _ in range(self.max_shots):
+            angle, power = self.shooters[self.player](self, self.player)
+            outcome = self.fire(angle, power)
+            if outcome == physics.HIT_SHIP1:
+                return self.end_round(1)
+            if outcome == physics.HIT_SHIP2:
+                return self.end_round(2)
+        return RoundResult(0, False, self.max_shots, (0, 0))
+
+    def play(self, rounds):
+        """Play a game of rounds rounds. @return: list of RoundResults"""
+        self.new_game()
+        return [self.play_round() for _ in range(rounds)]
@@ -36,8 +36,20 @@ class Menu:
         self.count = 0
         self.inc = 15
         self.copyright = copyright
+        # Everything but the selected item, drawn by render()
+        self.static = None
+        # What draw() returns: static with the selected item on top
+        self.image = None
+        self.selected_rect = None
+        # Item labels, keyed by text and colour
+        self.labels = {}
+
+    def invalidate(self):
+        """Render the menu from scratch when it is drawn next."""
+        self.static = None
 
     def change_active(self, item, a):
+        self.invalidate()
         for i in range(0, self.items.__len__()):
             if self.items[i][0] == item:
                 self.items[i] = (
@@ -48,12 +60,15 @@ class Menu:
                 )
 
     def add(self, item):
+        self.invalidate()
         self.items.append((item, 0, False, True))
 
     def addoption(self, item, v=False, a=True):
+        self.invalidate()
         self.items.append((item, 1, v, a))
 
     def up(self):
+        self.invalidate()
         self.selected = self.selected - 1
         if self.selected < 0:
             self.selected = self.items.__len__() - 1
@@ -64,6 +79,7 @@ class Menu:
         self.up()
 
     def down(self):
+        self.invalidate()
         self.selected = self.selected + 1
         if self.selected >= self.items.__len__():
             self.selected = 0
@@ -77,6 +93,7 @@ class Menu:
         return self.items[self.selected][0]
 
     def reset(self):
+        self.invalidate()
         self.selected = 0
         self.choice = ""
 
@@ -90,6 +107,7 @@ class Menu:
         return 500
 
     def select(self):
+        self.invalidate()
         if self.items[self.selected][1]:
             self.items[self.selected] = (
                 self.items[self.selected][0],
@@ -104,7 +122,56 @@ class Menu:
         self.choice = ""
         return c
 
+    def label(self, i, color):
+        """The label of item i in color."""
+        key = (self.items[i][0], color)
+        txt = self.labels.get(key)
+        if txt is None:
+            txt = self.labels[key] = Settings.menu_font.render(
+                self.items[i][0], 1, color
+            )
+        return txt
+
+    def place(self, i, txt):
+        """The rect of item i's label txt."""
+        if self.items[i][1] == 1:
+            offset = 35
+        else:
+            offset = 0
+        return txt.get_rect(
+            topleft=(
+                25 + offset,
+                2.5 * Settings.MENU_LINEFEED + Settings.MENU_LINEFEED * i,
+            )
+        )
+
     def draw(self):
+        """
+        The menu with its selected item pulsing.
+
+        Everything else comes from a cached image, rendered again only
+        after the menu changed.
+        """
+        if self.static is None:
+            self.static = self.render()
+            self.image = self.static.copy()
+            self.selected_rect = None
+        if self.selected_rect is not None:
+            self.image.blit(self.static, self.selected_rect, self.selected_rect)
+        self.selected_rect = None
+        if 0 <= self.selected < len(self.items):
+            txt = self.label(self.selected, (self.count, self.count, 255))
+            self.selected_rect = self.image.blit(txt, self.place(self.selected, txt))
+
+        self.count += self.inc
+        if self.count > 255 or self.count < 0:
+            self.inc *= -1
+            self.count += 2 * self.inc
+
+        return self.image
+
+    def render(self):
+        """Draw the menu without its selected item."""
         w = self.get_width()
         h = self.get_height()
         result = pygame.Surface((w, h))
@@ -143,10 +210,10 @@ class Menu:
                 # We want our text to start at 20px from the left
                 # side and 305 px from the top.
                 result.blit(line, (20, 305 + y))
-                version = Settings.fineprint.render(
-                    "Version " + Settings.VERSION, True, (230, 230, 230)
-                )
-                result.blit(version, (345 - version.get_width(), 3))
+            version = Settings.fineprint.render(
+                "Version " + Settings.VERSION, True, (230, 230, 230)
+            )
+            result.blit(version, (345 - version.get_width(), 3))
 
         txt = Settings.menu_font.render(self.name, 1, (255, 255, 255))
         rect = txt.get_rect()
@@ -155,14 +222,10 @@ class Menu:
 
         n = self.items.__len__()
         for i in range(0, n):
-            if i == self.selected:
-                color = (self.count, self.count, 255)
+            if self.items[i][3]:
+                color = (0, 0, 255)
             else:
-                if self.items[i][3]:
-                    color = (0, 0, 255)
-                else:
-                    color = (75, 75, 75)
-            txt = Settings.menu_font.render(self.items[i][0], 1, color)
+                color = (75, 75, 75)
             if self.items[i][1] == 1:
                 offset = 35
                 result.blit(
@@ -190,23 +253,12 @@ class Menu:
                                 - 8,
                             ),
                         )
-            else:
-                offset = 0
-            result.blit(
-                txt,
-                (
-                    25 + offset,
-                    2.5 * Settings.MENU_LINEFEED + Settings.MENU_LINEFEED * i,
-                ),
-            )
+            if i != self.selected:
+                txt = self.label(i, color)
+                result.blit(txt, self.place(i, txt))
 
         pygame.draw.rect(result, (0, 0, 200), pygame.Rect(0, 0, w, h), 1)
 
-        self.count += self.inc
-        if self.count > 255 or self.count < 0:
-            self.inc *= -1
-            self.count += 2 * self.inc
-
         return result
 
 
@@ -298,11 +350,13 @@ class Numeric(Menu):
         self.choice = -1
 
     def up(self):
+        self.invalidate()
         self.val += self.step
         if self.val > self.mmax:
             self.val = self.mmax
 
     def down(self):
+        self.invalidate()
         self.val -= self.step
         if self.val < self.mmin:
             self.val = self.mmin
@@ -315,7 +369,7 @@ class Numeric(Menu):
         self.choice = -1
         return c
 
-    def draw(self):
+    def render(self):
         w = self.get_width()
         h = self.get_height()
         result = pygame.Surface((w, h))
@@ -347,7 +401,23 @@ class Confirm(Menu):
         self.txt2 = txt2
         self.txt3 = txt3
 
-    def draw(self):
+    def place(self, i, txt):
+        w = self.get_width()
+        offset = Settings.MENU_LINEFEED * ((self.txt2 != "") + (self.txt3 != ""))
+        rect = txt.get_rect()
+        if i == 0:
+            rect.topright = (
+                w / 2 - Settings.MENU_LINEFEED,
+                3 * Settings.MENU_LINEFEED + offset,
+            )
+        else:
+            rect.topleft = (
+                w / 2 + Settings.MENU_LINEFEED,
+                3 * Settings.MENU_LINEFEED + offset,
+            )
+        return rect
+
+    def render(self):
         offset = 0
 
         w = self.get_width()
@@ -376,29 +446,10 @@ class Confirm(Menu):
             result.blit(txt, rect.topleft)
 
         for i in range(0, 2):
-            if i == self.selected:
-                color = (self.count, self.count, 255)
-            else:
-                color = (0, 0, 255)
-            txt = Settings.menu_font.render(self.items[i][0], 1, color)
-            rect = txt.get_rect()
-            if i == 0:
-                rect.topright = (
-                    w / 2 - Settings.MENU_LINEFEED,
-                    3 * Settings.MENU_LINEFEED + offset,
-                )
-            else:
-                rect.topleft = (
-                    w / 2 + Settings.MENU_LINEFEED,
-                    3 * Settings.MENU_LINEFEED + offset,
-                )
-            result.blit(txt, rect.topleft)
+            if i != self.selected:
+                txt = self.label(i, (0, 0, 255))
+                result.blit(txt, self.place(i, txt))
 
         pygame.draw.rect(result, (0, 0, 200), pygame.Rect(0, 0, w, h), 1)
 
-        self.count += self.inc
-        if self.count > 255 or self.count < 0:
-            self.inc *= -1
-            self.count += 2 * self.inc
-
         return result
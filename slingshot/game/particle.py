@@ -24,10 +24,13 @@
 
 import math
 from random import randint
+import numpy
 import pygame
 
 from game.settings import *
 from game.general import *
+from game import physics
+from game import text
 
 
 class Particle(pygame.sprite.Sprite):
@@ -60,12 +63,16 @@ class Particle(pygame.sprite.Sprite):
         else:
             return False
 
-    def update(self, planets):
+    def update(self, planets, field=None, index=None):
         """
         Updates information about ourselves, namely our location.
 
         @param planets: list of planets
         @type planets: [Planet]
+        @param field: optional precomputed gravity
+        @type field: GravityField
+        @param index: optional grid to look up nearby planets in
+        @type index: BodyGrid
 
         @return: -1 if we've hit a black hole
                     0 if we've hit a planet
@@ -76,104 +83,35 @@ class Particle(pygame.sprite.Sprite):
 
         self.last_pos = self.pos
 
-        for p in planets:
-            p_pos = p.get_pos()
-            mass = p.get_mass()
-            dx = self.pos[0] - p_pos[0]
-            dy = self.pos[1] - p_pos[1]
-            d = dx**2 + dy**2
-            # a is the acceleration in pixels/tick
-            #  ->   [ G * m_p * \delta d_x     G * m_p * \delta d_y   ]
-            #  a  = [ ---------------------- , ---------------------- ]
-            #       [      r ^ (1/3)                 r ^ (1/3)        ]
-            try:
-                a = (
-                    (Settings.g * mass * dx) / (d * math.sqrt(d)),
-                    (Settings.g * mass * dy) / (d * math.sqrt(d)),
-                )
-            except ZeroDivisionError:
-                # Hackishly take any silly particles out of the game.
-                a = (10000, 10000)
-            # It's been a tick, update our velocity according to our
-            # acceleration
-            self.v = (self.v[0] - a[0], self.v[1] - a[1])
-
-        self.pos = (self.pos[0] + self.v[0], self.pos[1] + self.v[1])
-
-        if not self.in_range():
+        result, self.pos, self.v, impact_pos = physics.step(
+            self.pos,
+            self.v,
+            physics.as_bodies(planets),
+            Settings.BOUNCE,
+            field,
+            Settings.INTEGRATOR,
+            index,
+        )
+        if impact_pos is not None:
+            self.impact_pos = impact_pos
+
+        if result == physics.OUT_OF_RANGE:
             return 0
-
-        for p in planets:
-            p_pos = p.get_pos()
-            r = p.get_radius()
-            # d is not the distance from the planet, it's the distance squared.
-            d = (self.pos[0] - p_pos[0]) ** 2 + (self.pos[1] - p_pos[1]) ** 2
-            if p.type == "Blackhole":
-                min_dist = p.get_mass()
-                if d <= min_dist:
-                    self.impact_pos = p_pos
-                    self.pos = self.impact_pos
-                    return -1
-            elif d <= (r) ** 2:
-                # This is a planet
-                self.impact_pos = get_intersect(p_pos, r, self.last_pos, self.pos)
-                self.pos = self.impact_pos
-                return 0
-
-        if Settings.BOUNCE:
-            if self.pos[0] > 799:
-                d = self.pos[0] - self.last_pos[0]
-                self.pos = (
-                    799,
-                    self.last_pos[1]
-                    + (self.pos[1] - self.last_pos[1]) * (799 - self.last_pos[0]) / d,
-                )
-                self.v = (-self.v[0], self.v[1])
-            if self.pos[0] < 0:
-                d = self.last_pos[0] - self.pos[0]
-                self.pos = (
-                    0,
-                    self.last_pos[1]
-                    + (self.pos[1] - self.last_pos[1]) * self.last_pos[0] / d,
-                )
-                self.v = (-self.v[0], self.v[1])
-            if self.pos[1] > 599:
-                d = self.pos[1] - self.last_pos[1]
-                self.pos = (
-                    self.last_pos[0]
-                    + (self.pos[0] - self.last_pos[0]) * (599 - self.last_pos[1]) / d,
-                    599,
-                )
-                self.v = (self.v[0], -self.v[1])
-            if self.pos[1] < 0:
-                d = self.last_pos[1] - self.pos[1]
-                self.pos = (
-                    self.last_pos[0]
-                    + (self.pos[0] - self.last_pos[0]) * self.last_pos[1] / d,
-                    0,
-                )
-                self.v = (self.v[0], -self.v[1])
-        # print(self.pos)
-        # print(self.last_pos)
+        if result != physics.FLYING:
+            return result
 
         self.rect.center = (round(self.pos[0]), round(self.pos[1]))
         return 1
 
     def in_range(self):
-        if pygame.Rect(-800, -600, 2400, 1800).collidepoint(self.pos):
-            return True
-        else:
-            return False
+        return physics.in_range(self.pos)
 
     def visible(self):
         """
         Returns whether or not the particle is within the playing area.
 
         """
-        if pygame.Rect(0, 0, 800, 600).collidepoint(self.pos):
-            return True
-        else:
-            return False
+        return physics.visible(self.pos)
 
     def get_pos(self):
         return self.pos
@@ -185,6 +123,114 @@ class Particle(pygame.sprite.Sprite):
         return self.size
 
 
+class ParticleSystem:
+    """
+    All explosion particles of a round, stepped together with NumPy.
+
+    Instead of one sprite per particle, positions, velocities, flight
+    counters and sizes live in parallel arrays. Particles of size 10 that
+    hit a planet break up into Settings.n_PARTICLES_5 particles of size 5.
+    """
+
+    def __init__(self):
+        self.pos = numpy.empty((0, 2))
+        self.v = numpy.empty((0, 2))
+        self.flight = numpy.empty(0, dtype=int)
+        self.size = numpy.empty(0, dtype=int)
+
+    def __len__(self):
+        return len(self.flight)
+
+    def add(self, pos, n, size):
+        """Spawn n particles of the given size (5 or 10) at pos."""
+        if n <= 0:
+            return
+        if size == 5:
+            speed = numpy.random.randint(
+                Settings.PARTICLE_5_MINSPEED, Settings.PARTICLE_5_MAXSPEED + 1, n
+            )
+        else:
+            speed = numpy.random.randint(
+                Settings.PARTICLE_10_MINSPEED, Settings.PARTICLE_10_MAXSPEED + 1, n
+            )
+        angle = numpy.random.uniform(0, 2 * math.pi, n)
+        v = numpy.column_stack(
+            (0.1 * speed * numpy.sin(angle), -0.1 * speed * numpy.cos(angle))
+        )
+        self.pos = numpy.concatenate((self.pos, numpy.tile(pos, (n, 1))))
+        self.v = numpy.concatenate((self.v, v))
+        self.flight = numpy.concatenate(
+            (self.flight, numpy.full(n, Settings.MAX_FLIGHT))
+        )
+        self.size = numpy.concatenate((self.size, numpy.full(n, size)))
+
+    def clear(self):
+        self.__init__()
+
+    def update(self, planets, field=None, index=None):
+        """
+        Move all particles one tick and remove the ones that are done.
+
+        @param planets: list of planets
+        @type planets: [Planet]
+        @param field: optional precomputed gravity
+        @type field: GravityField
+        @param index: optional grid to look up nearby planets in
+        @type index: BodyGrid
+        """
+        if len(self) == 0:
+            return
+        self.flight = self.flight - 1
+        # Debris always uses the cheap EULER integrator.
+        outcome, self.pos, self.v, impact_pos = physics.step_many(
+            self.pos,
+            self.v,
+            physics.body_arrays(planets),
+            Settings.BOUNCE,
+            field,
+            physics.EULER,
+            index,
+        )
+
+        dead = (outcome != physics.FLYING) | (self.flight < 0)
+        breakup = (
+            (outcome == physics.HIT_PLANET) & (self.flight >= 0) & (self.size == 10)
+        )
+        if Settings.BOUNCE:
+            n = Settings.n_PARTICLES_5 // 2
+        else:
+            n = Settings.n_PARTICLES_5
+        impacts = impact_pos[breakup]
+
+        alive = ~dead
+        self.pos = self.pos[alive]
+        self.v = self.v[alive]
+        self.flight = self.flight[alive]
+        self.size = self.size[alive]
+
+        for pos in impacts:
+            self.add(pos, n, 5)
+
+    def draw(self, screen):
+        """Draw all particles with a single Surface.blits call."""
+        if len(self) == 0:
+            return
+        topleft = numpy.rint(self.pos).astype(int)
+        for size, image in (
+            (10, Settings.particle_image10),
+            (5, Settings.particle_image5),
+        ):
+            topleft[self.size == size] -= (
+                image.get_width() // 2,
+                image.get_height() // 2,
+            )
+        images = [
+            Settings.particle_image10 if size == 10 else Settings.particle_image5
+            for size in self.size.tolist()
+        ]
+        screen.blits(list(zip(images, map(tuple, topleft.tolist()))), False)
+
+
 class Missile(Particle):
     def __init__(self, trail_screen):
         Particle.__init__(self)  # call Sprite intializer
@@ -192,58 +238,92 @@ class Missile(Particle):
         self.rect = self.image.get_rect()
         self.trail_screen = trail_screen
         self.last_pos = (0.0, 0.0)
+        # Positions flown through since the trail was last drawn
+        self.trail = []
+        # All positions of this shot
+        self.path = []
 
     def launch(self, player):
         self.flight = Settings.MAX_FLIGHT
         self.pos = player.get_launchpoint()
         speed = player.get_power()
-        angle = math.radians(player.get_angle())
-        self.v = (0.1 * speed * math.sin(angle), -0.1 * speed * math.cos(angle))
+        self.v = physics.launch_velocity(player.get_angle(), speed)
         self.trail_color = player.get_color()
+        self.trail = [self.pos]
+        self.path = [self.pos]
 
         self.score = -Settings.PENALTY_FACTOR * speed
 
     def update_players(self, players):
-        result = 1
-
-        for i in range(10):
-            pos = (
-                self.last_pos[0] + i * 0.1 * self.v[0],
-                self.last_pos[1] + i * 0.1 * self.v[1],
-            )
-            if players[1].hit(pos):
-                result = 0
-            if players[2].hit(pos):
-                result = 0
-            if result == 0:
-                self.impact_pos = pos
-                self.pos = pos
-                break
-        return result
+        """Sweep our last move against both ships, 0 if one was hit."""
+        ship, pos = physics.hit_ships(
+            (players[1].get_ship(), players[2].get_ship()), self.last_pos, self.pos
+        )
+        if ship == physics.FLYING:
+            return 1
+        players[ship - physics.HIT_SHIP1 + 1].shot = True
+        self.impact_pos = pos
+        self.pos = pos
+        return 0
 
     def draw_status(self, screen):
-        txt = Settings.font.render(f"Power penalty: {-self.score}", 1, (255, 255, 255))
+        txt = text.cache.render(
+            Settings.font, f"Power penalty: {-self.score}", 1, (255, 255, 255)
+        )
         rect = txt.get_rect()
         rect.midtop = (399, 5)
         screen.blit(txt, rect.topleft)
         if self.flight >= 0:
-            txt = Settings.font.render(f"Timeout in {self.flight}", 1, (255, 255, 255))
+            text.cache.draw(
+                screen,
+                Settings.font,
+                f"Timeout in {self.flight}",
+                1,
+                (255, 255, 255),
+                midbottom=(399, 594),
+            )
         else:
-            txt = Settings.font.render("Shot timed out...", 1, (255, 255, 255))
-        rect = txt.get_rect()
-        rect.midbottom = (399, 594)
-        screen.blit(txt, rect.topleft)
+            txt = text.cache.render(
+                Settings.font, "Shot timed out...", 1, (255, 255, 255)
+            )
+            rect = txt.get_rect()
+            rect.midbottom = (399, 594)
+            screen.blit(txt, rect.topleft)
 
-    def update(self, planets, players):
-        result = Particle.update(self, planets)
+    def update(self, planets, players, field=None, index=None):
+        result = Particle.update(self, planets, field, index)
         result = result * self.update_players(players)
+        # A shot that has escaped is lost, there is no point in waiting
+        # for it to time out.
+        if (
+            result == 1
+            and Settings.ESCAPE_DETECTION
+            and self.flight % Settings.ESCAPE_INTERVAL == 0
+            and physics.escaping(self.pos, self.v, physics.as_bodies(planets))
+        ):
+            result = 0
         # Draws the missile's trajectory only if we haven't entered a black hole.
         if result != -1:
-            pygame.draw.aaline(
-                self.trail_screen, self.trail_color, self.last_pos, self.pos
-            )
+            self.trail.append(self.pos)
+            self.path.append(self.pos)
         return result
 
+    def draw_trail(self):
+        """
+        Draw the trajectory flown since the last call as one polyline.
+
+        @return: the area drawn to, None if there was nothing to draw
+        """
+        rect = None
+        if len(self.trail) > 1:
+            rect = pygame.draw.aalines(
+                self.trail_screen, self.trail_color, False, self.trail
+            )
+            # The rect aalines returns can miss the edge of the antialiasing.
+            rect = rect.inflate(4, 4)
+        self.trail = self.trail[-1:]
+        return rect
+
     def get_image(self):
         return self.image
 
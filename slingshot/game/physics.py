@@ -0,0 +1,1150 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""
+Headless shot physics.
+
+Everything in here works on plain floats and tuples so that shots can be
+simulated without a display, sprites or even pygame itself. The sprite
+classes in game.particle are thin wrappers around step().
+
+The *_many() functions do the same for whole arrays of shots at once with
+NumPy, one row per shot. They follow the scalar code operation for
+operation, so a shot stepped on its own or as part of a batch ends up in
+exactly the same place.
+"""
+
+import hashlib
+import math
+from collections import OrderedDict, namedtuple
+
+import numpy
+
+from game.settings import Settings
+
+# Outcomes of a simulation step. HIT_PLANET, HIT_BLACKHOLE and FLYING keep
+# the values Particle.update has always returned.
+HIT_BLACKHOLE = -1
+HIT_PLANET = 0
+FLYING = 1
+OUT_OF_RANGE = 2
+TIMEOUT = 3
+HIT_SHIP1 = 4
+HIT_SHIP2 = 5
+ESCAPED = 6
+
+# (left, top, width, height) of the area in which shots are simulated and
+# of the visible playing field.
+RANGE_RECT = (-800, -600, 2400, 1800)
+VIEW_RECT = (0, 0, 800, 600)
+
+# Integrators, see Settings.INTEGRATOR. EULER is what the game has always
+# used: one kick and one drift per tick.
+EULER = "euler"
+LEAPFROG = "leapfrog"
+
+Body = namedtuple("Body", "pos radius mass blackhole")
+Body.__doc__ = "A planet or black hole, as far as the physics is concerned."
+
+
+Ship = namedtuple("Ship", "rect mask")
+Ship.__doc__ = """A ship as a (left, top, width, height) rect and a boolean
+(height, width) array of its opaque pixels, or None to use the whole rect."""
+
+ShipArrays = namedtuple("ShipArrays", "rects ships")
+ShipArrays.__doc__ = """One Ship per shot of a simulate_many() call, such as the
+shooter turned to the angle of each shot: an (n, 4) array of the rects and
+an array of the Ships."""
+
+BodyArrays = namedtuple("BodyArrays", "pos radius mass blackhole")
+BodyArrays.__doc__ = "Bodies as parallel NumPy arrays, for the *_many() functions."
+
+
+def body_from_sprite(planet):
+    """Build a Body from anything that quacks like a Planet."""
+    return Body(
+        planet.get_pos(),
+        planet.get_radius(),
+        planet.get_mass(),
+        planet.type == "Blackhole",
+    )
+
+
+def as_bodies(planets):
+    """
+    Return planets as a list of Bodies.
+
+    @param planets: Bodies, or Planet sprites (which carry a cached body)
+    @type planets: iterable
+    """
+    result = []
+    for p in planets:
+        if isinstance(p, Body):
+            result.append(p)
+        else:
+            result.append(p.body)
+    return result
+
+
+def body_arrays(bodies):
+    """Convert bodies (or Planet sprites) to BodyArrays."""
+    if isinstance(bodies, BodyArrays):
+        return bodies
+    bodies = as_bodies(bodies)
+    return BodyArrays(
+        numpy.array([b.pos for b in bodies], dtype=float).reshape(-1, 2),
+        numpy.array([b.radius for b in bodies], dtype=float),
+        numpy.array([b.mass for b in bodies], dtype=float),
+        numpy.array([b.blackhole for b in bodies], dtype=bool),
+    )
+
+
+def get_intersect(center, r, pos1, pos2):
+    dx = pos2[0] - pos1[0]
+    dy = pos2[1] - pos1[1]
+    px = pos1[0]
+    py = pos1[1]
+    cx = center[0]
+    cy = center[1]
+    a = dx**2 + dy**2
+    b = 2 * (dx * px - dx * cx + dy * py - dy * cy)
+    c = -2 * cx * px - 2 * cy * py + px**2 + py**2 + cx**2 + cy**2 - r**2
+    D = b**2 - 4 * a * c
+    if D < 0:
+        return (4000.0, 3000.0)
+    alpha = (-b + math.sqrt(D)) / (2 * a)
+    if alpha > 1:
+        alpha = (-b - math.sqrt(D)) / (2 * a)
+    alpha = alpha - 0.05
+    pos = (px + alpha * dx, py + alpha * dy)
+    return pos
+
+
+def collidepoint(rect, pos):
+    """Same semantics as pygame.Rect.collidepoint, including truncation."""
+    try:
+        x = int(pos[0])
+        y = int(pos[1])
+    except (OverflowError, ValueError):
+        return False
+    return rect[0] <= x < rect[0] + rect[2] and rect[1] <= y < rect[1] + rect[3]
+
+
+def in_range(pos):
+    return collidepoint(RANGE_RECT, pos)
+
+
+def visible(pos):
+    return collidepoint(VIEW_RECT, pos)
+
+
+def accelerate(pos, v, bodies):
+    """
+    Apply one tick of gravity from all bodies to the velocity v.
+
+    The order of operations matches the original Particle.update so that
+    trajectories are reproduced bit for bit.
+    """
+    vx, vy = v
+    for b in bodies:
+        dx = pos[0] - b.pos[0]
+        dy = pos[1] - b.pos[1]
+        d = dx**2 + dy**2
+        # a is the acceleration in pixels/tick
+        #  ->   [ G * m_p * \delta d_x     G * m_p * \delta d_y   ]
+        #  a  = [ ---------------------- , ---------------------- ]
+        #       [      r ^ (1/3)                 r ^ (1/3)        ]
+        try:
+            ax = (Settings.g * b.mass * dx) / (d * math.sqrt(d))
+            ay = (Settings.g * b.mass * dy) / (d * math.sqrt(d))
+        except ZeroDivisionError:
+            # Hackishly take any silly particles out of the game.
+            ax, ay = (10000, 10000)
+        vx = vx - ax
+        vy = vy - ay
+    return (vx, vy)
+
+
+def substeps(pos, bodies):
+    """
+    Number of leapfrog substeps needed for one tick at pos.
+
+    Each body allows a substep of LEAPFROG_ETA times its dynamical time
+    sqrt(r^3 / (g * m)) at distance r; far from everything that is more
+    than a tick, so quiet stretches take a single step.
+    """
+    slowest = math.inf
+    for b in bodies:
+        d = (pos[0] - b.pos[0]) ** 2 + (pos[1] - b.pos[1]) ** 2
+        slowest = min(slowest, d * math.sqrt(d) / (Settings.g * b.mass))
+    if slowest == math.inf:
+        return 1
+    n = math.ceil(1 / (Settings.LEAPFROG_ETA * math.sqrt(slowest) + 1e-9))
+    return max(1, min(n, Settings.LEAPFROG_MAX_SUBSTEPS))
+
+
+def leapfrog(pos, v, bodies, field=None):
+    """
+    One tick of drift-kick-drift leapfrog with adaptive substeps.
+
+    Unlike EULER this is second order and time reversible, so orbits keep
+    their energy instead of slowly spiralling.
+    """
+    n = substeps(pos, bodies)
+    dt = 1.0 / n
+    x, y = pos
+    vx, vy = v
+    for _ in range(n):
+        x += 0.5 * dt * vx
+        y += 0.5 * dt * vy
+        if field is None:
+            ax, ay = accelerate((x, y), (0.0, 0.0), bodies)
+        else:
+            ax, ay = field.accelerate((x, y), (0.0, 0.0))
+        vx += dt * ax
+        vy += dt * ay
+        x += 0.5 * dt * vx
+        y += 0.5 * dt * vy
+    return ((x, y), (vx, vy))
+
+
+def collide(last_pos, pos, bodies, index=None):
+    """
+    Check whether the segment last_pos -> pos ended inside a body.
+
+    @param index: optional spatial.BodyGrid over the same bodies, to only
+                  check the ones near pos
+
+    @return: (outcome, impact_pos), impact_pos is None if nothing was hit
+    """
+    if index is not None:
+        bodies = index.near(pos)
+    for b in bodies:
+        d = (pos[0] - b.pos[0]) ** 2 + (pos[1] - b.pos[1]) ** 2
+        if b.blackhole:
+            if d <= b.mass:
+                return (HIT_BLACKHOLE, b.pos)
+        elif d <= b.radius**2:
+            return (HIT_PLANET, get_intersect(b.pos, b.radius, last_pos, pos))
+    return (FLYING, None)
+
+
+def bounce(last_pos, pos, v):
+    """Reflect a shot off the edges of the screen."""
+    if pos[0] > 799:
+        d = pos[0] - last_pos[0]
+        pos = (799, last_pos[1] + (pos[1] - last_pos[1]) * (799 - last_pos[0]) / d)
+        v = (-v[0], v[1])
+    if pos[0] < 0:
+        d = last_pos[0] - pos[0]
+        pos = (0, last_pos[1] + (pos[1] - last_pos[1]) * last_pos[0] / d)
+        v = (-v[0], v[1])
+    if pos[1] > 599:
+        d = pos[1] - last_pos[1]
+        pos = (last_pos[0] + (pos[0] - last_pos[0]) * (599 - last_pos[1]) / d, 599)
+        v = (v[0], -v[1])
+    if pos[1] < 0:
+        d = last_pos[1] - pos[1]
+        pos = (last_pos[0] + (pos[0] - last_pos[0]) * last_pos[1] / d, 0)
+        v = (v[0], -v[1])
+    return (pos, v)
+
+
+def escaping(pos, v, bodies):
+    """
+    Check whether a shot has escaped for good.
+
+    That is when its specific orbital energy 1/2 v^2 - sum(g * m / r) is
+    positive, it moves away from every body and it is farther from every
+    body than any point of the screen is. For a single body the distance
+    then only grows, so the shot can never come back into view; with
+    several bodies it is a very good guess.
+    """
+    if visible(pos):
+        return False
+    # Plain products rather than **, so escaping_many() rounds the same.
+    energy = 0.5 * (v[0] * v[0] + v[1] * v[1])
+    left, top, w, h = VIEW_RECT
+    for b in bodies:
+        dx = pos[0] - b.pos[0]
+        dy = pos[1] - b.pos[1]
+        if dx * v[0] + dy * v[1] <= 0:
+            return False
+        d = dx * dx + dy * dy
+        far_x = max(b.pos[0] - left, left + w - b.pos[0])
+        far_y = max(b.pos[1] - top, top + h - b.pos[1])
+        if d <= far_x * far_x + far_y * far_y:
+            return False
+        energy -= Settings.g * b.mass / math.sqrt(d)
+    return energy > 0
+
+
+def step(pos, v, bodies, bouncing=False, field=None, integrator=EULER, index=None):
+    """
+    Advance a shot by one tick.
+
+    @param pos: (x, y) position
+    @param v: (x velocity, y velocity) in pixels/tick
+    @param bodies: list of Bodies
+    @param bouncing: whether shots bounce off the screen edges
+    @param field: optional gravity.GravityField to take the acceleration from
+    @param integrator: EULER or LEAPFROG
+    @param index: optional spatial.BodyGrid over bodies for the collision check
+
+    @return: (outcome, pos, v, impact_pos). outcome is FLYING, HIT_PLANET,
+             HIT_BLACKHOLE or OUT_OF_RANGE. On a hit pos is the impact
+             position, impact_pos is None unless something was hit.
+    """
+    last_pos = pos
+    if integrator == LEAPFROG:
+        pos, v = leapfrog(pos, v, bodies, field)
+    else:
+        if field is None:
+            v = accelerate(pos, v, bodies)
+        else:
+            v = field.accelerate(pos, v)
+        pos = (pos[0] + v[0], pos[1] + v[1])
+
+    if not in_range(pos):
+        return (OUT_OF_RANGE, pos, v, None)
+
+    outcome, impact_pos = collide(last_pos, pos, bodies, index)
+    if outcome != FLYING:
+        return (outcome, impact_pos, v, impact_pos)
+
+    if bouncing:
+        pos, v = bounce(last_pos, pos, v)
+    return (FLYING, pos, v, None)
+
+
+def launch_velocity(angle, power):
+    """Initial velocity of a shot fired at angle (degrees) with power."""
+    angle = math.radians(angle)
+    return (0.1 * power * math.sin(angle), -0.1 * power * math.cos(angle))
+
+
+def launch_point(center, d, angle):
+    """Tip of the gun of a ship at center, rotated to angle (degrees)."""
+    return (
+        center[0] + d * math.sin(math.radians(angle)),
+        center[1] - d * math.cos(math.radians(angle)),
+    )
+
+
+def ship_hit(ship, pos):
+    """Same test as Player.hit, on a Ship."""
+    if not collidepoint(ship.rect, pos):
+        return False
+    x = int(round(pos[0] - ship.rect[0]))
+    y = int(round(pos[1] - ship.rect[1]))
+    if x <= 1 or y <= 1:
+        return False
+    if ship.mask is None:
+        return True
+    return bool(ship.mask[y - 1, x - 1])
+
+
+def ship_sweep(ship, pos1, pos2):
+    """
+    Find where the segment pos1 -> pos2 first touches the ship.
+
+    A point hits the ship if ship_hit() says so, which makes the ship a
+    grid of mask cells offset by half a pixel. The segment is clipped to
+    that grid and walked cell by cell (Amanatides & Woo), so nothing
+    tunnels through, however fast the shot.
+
+    @return: (t, (x, y)) of the first hit, t in [0, 1] along the segment,
+             or None
+    """
+    left, top, w, h = ship.rect
+    # Grid coordinates: cell (i, j) is mask[j, i], cells 0 are never hit.
+    x0 = pos1[0] - left - 0.5
+    y0 = pos1[1] - top - 0.5
+    dx = pos2[0] - pos1[0]
+    dy = pos2[1] - pos1[1]
+
+    t0 = 0.0
+    t1 = 1.0
+    for p, d, hi in ((x0, dx, w - 0.5), (y0, dy, h - 0.5)):
+        if d == 0:
+            if not 1 <= p < hi:
+                return None
+        else:
+            ta = (1 - p) / d
+            tb = (hi - p) / d
+            if ta > tb:
+                ta, tb = tb, ta
+            t0 = max(t0, ta)
+            t1 = min(t1, tb)
+    if t0 > t1:
+        return None
+
+    i = min(max(int(math.floor(x0 + t0 * dx)), 1), w - 1)
+    j = min(max(int(math.floor(y0 + t0 * dy)), 1), h - 1)
+    if dx > 0:
+        step_i, next_i, delta_i = 1, (i + 1 - x0) / dx, 1 / dx
+    elif dx < 0:
+        step_i, next_i, delta_i = -1, (i - x0) / dx, -1 / dx
+    else:
+        step_i, next_i, delta_i = 0, math.inf, math.inf
+    if dy > 0:
+        step_j, next_j, delta_j = 1, (j + 1 - y0) / dy, 1 / dy
+    elif dy < 0:
+        step_j, next_j, delta_j = -1, (j - y0) / dy, -1 / dy
+    else:
+        step_j, next_j, delta_j = 0, math.inf, math.inf
+
+    t = t0
+    while True:
+        if ship.mask is None or ship.mask[j, i]:
+            return (t, (pos1[0] + t * dx, pos1[1] + t * dy))
+        if next_i < next_j:
+            t = next_i
+            i += step_i
+            next_i += delta_i
+        else:
+            t = next_j
+            j += step_j
+            next_j += delta_j
+        if t > t1 or not (1 <= i < w and 1 <= j < h):
+            return None
+
+
+def hit_ships(ships, last_pos, pos):
+    """
+    Sweep the last tick, last_pos -> pos, against both ships.
+
+    @param ships: (ship 1, ship 2), either may be None
+    @return: (HIT_SHIP1, HIT_SHIP2 or FLYING, position of the hit)
+    """
+    result = (FLYING, None)
+    first = math.inf
+    for ship, outcome in zip(ships, (HIT_SHIP1, HIT_SHIP2)):
+        if ship is None:
+            continue
+        hit = ship_sweep(ship, last_pos, pos)
+        if hit is not None and hit[0] < first:
+            first = hit[0]
+            result = (outcome, hit[1])
+    return result
+
+
+def simulate(
+    pos,
+    v,
+    bodies,
+    max_flight=None,
+    bouncing=None,
+    ships=None,
+    max_ticks=None,
+    field=None,
+    integrator=None,
+    index=None,
+    escape=None,
+):
+    """
+    Fly a shot until it hits something, leaves the range, escapes or
+    times out.
+
+    Like in the game, a timed out shot keeps flying until it leaves the
+    screen. max_ticks (default 2 * max_flight) stops it for good.
+
+    @param ships: optional (ship 1, ship 2) pair of Ships
+    @param field: optional gravity.GravityField, see step()
+    @param integrator: EULER or LEAPFROG, default Settings.INTEGRATOR
+    @param index: optional spatial.BodyGrid, see step()
+    @param escape: whether to stop escaping() shots as ESCAPED, default
+                   Settings.ESCAPE_DETECTION. Like in the game this is
+                   checked every Settings.ESCAPE_INTERVAL ticks.
+
+    @return: (outcome, trajectory, impact_pos, ticks). trajectory is the
+             list of positions starting with the launch point, impact_pos
+             is where the shot ended.
+    """
+    if max_flight is None:
+        max_flight = Settings.MAX_FLIGHT
+    if bouncing is None:
+        bouncing = Settings.BOUNCE
+    if max_ticks is None:
+        max_ticks = 2 * max_flight
+    if integrator is None:
+        integrator = Settings.INTEGRATOR
+    if escape is None:
+        escape = Settings.ESCAPE_DETECTION
+    bodies = as_bodies(bodies)
+
+    trajectory = [pos]
+    flight = max_flight
+    ticks = 0
+    while True:
+        flight -= 1
+        ticks += 1
+        last_pos = pos
+        outcome, pos, v, impact_pos = step(
+            pos, v, bodies, bouncing, field, integrator, index
+        )
+        if ships is not None:
+            ship, ship_pos = hit_ships(ships, last_pos, pos)
+            if ship != FLYING:
+                outcome, pos, impact_pos = ship, ship_pos, ship_pos
+        if (
+            outcome == FLYING
+            and escape
+            and flight % Settings.ESCAPE_INTERVAL == 0
+            and escaping(pos, v, bodies)
+        ):
+            outcome = ESCAPED
+        if outcome in (OUT_OF_RANGE, ESCAPED):
+            impact_pos = pos
+        trajectory.append(pos)
+        if outcome != FLYING:
+            return (outcome, trajectory, impact_pos, ticks)
+        if (flight < 0 and not visible(pos)) or ticks >= max_ticks:
+            return (TIMEOUT, trajectory, pos, ticks)
+
+
+def serialize_layout(planets):
+    """
+    The (n, radius, mass, pos) list Game.host_round_init sends to clients.
+
+    Bodies have no planet number, they use their black hole flag instead.
+    """
+    result = []
+    for p in planets:
+        if isinstance(p, Body):
+            result.append((p.blackhole, p.radius, p.mass, p.pos))
+        else:
+            result.append((p.get_n(), p.get_radius(), p.get_mass(), p.get_pos()))
+    return result
+
+
+def layout_key(planets):
+    """
+    A stable hash of a planet layout.
+
+    Sprites and Bodies go through as_bodies() first, so both hash alike.
+    """
+    return hashlib.sha1(repr(list(as_bodies(planets))).encode()).hexdigest()
+
+
+class TrajectoryCache:
+    """
+    A least recently used cache of simulate() results.
+
+    Entries are keyed on the layout, the launch parameters and everything
+    else simulate() depends on. The cache holds at most max_bytes worth of
+    trajectories and forgets everything when the layout changes.
+
+    Only the headless Match flies its shots through here. The missile in
+    the game and the computer player's search call the physics directly
+    and are not memoized.
+    """
+
+    # Rough cost of an entry on top of its trajectory, in bytes
+    ENTRY_OVERHEAD = 400
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = Settings.TRAJECTORY_CACHE_BYTES
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.layout = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def set_layout(self, planets):
+        """Switch to a new round's layout, dropping entries of the old one."""
+        key = layout_key(planets)
+        if key != self.layout:
+            self.clear()
+            self.layout = key
+
+    def ships_key(self, ships):
+        if ships is None:
+            return None
+        result = []
+        for ship in ships:
+            if ship is None or ship.mask is None:
+                result.append(ship)
+            else:
+                result.append((ship.rect, hashlib.sha1(ship.mask.tobytes()).digest()))
+        return tuple(result)
+
+    def simulate(
+        self,
+        pos,
+        angle,
+        power,
+        bodies,
+        ships=None,
+        max_flight=None,
+        bouncing=None,
+        max_ticks=None,
+        field=None,
+        integrator=None,
+        index=None,
+        escape=None,
+    ):
+        """
+        simulate() a shot fired from pos at angle with power, or look it up.
+
+        The other arguments are those of simulate(). The trajectory comes
+        back as a read-only (n, 2) array.
+        """
+        self.set_layout(bodies)
+        # Fill in the defaults the way simulate() does, so that leaving
+        # an option out and passing its default give the same key.
+        if max_flight is None:
+            max_flight = Settings.MAX_FLIGHT
+        if bouncing is None:
+            bouncing = Settings.BOUNCE
+        if max_ticks is None:
+            max_ticks = 2 * max_flight
+        if integrator is None:
+            integrator = Settings.INTEGRATOR
+        if escape is None:
+            escape = Settings.ESCAPE_DETECTION
+        # The field itself goes into the key, which keeps it alive, so
+        # its id cannot be handed to another field while we remember it.
+        options = (max_flight, bouncing, max_ticks, integrator, escape, field)
+        key = (
+            self.layout,
+            tuple(pos),
+            angle,
+            power,
+            self.ships_key(ships),
+            options,
+        )
+        result = self.entries.get(key)
+        if result is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return result
+
+        self.misses += 1
+        outcome, trajectory, impact_pos, ticks = simulate(
+            tuple(pos),
+            launch_velocity(angle, power),
+            bodies,
+            max_flight=max_flight,
+            bouncing=bouncing,
+            ships=ships,
+            max_ticks=max_ticks,
+            field=field,
+            integrator=integrator,
+            index=index,
+            escape=escape,
+        )
+        trajectory = numpy.array(trajectory)
+        trajectory.flags.writeable = False
+        result = (outcome, trajectory, impact_pos, ticks)
+
+        self.entries[key] = result
+        self.bytes += trajectory.nbytes + self.ENTRY_OVERHEAD
+        while self.bytes > self.max_bytes and self.entries:
+            _, (_, old, _, _) = self.entries.popitem(last=False)
+            self.bytes -= old.nbytes + self.ENTRY_OVERHEAD
+        return result
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+        }
+
+
+def _square(x):
+    # Python's x**2 goes through libm pow(), which does not always round
+    # like x * x. float_power() does the same, keeping batches bit exact.
+    return numpy.float_power(x, 2)
+
+
+def get_intersect_many(center, r, pos1, pos2):
+    """get_intersect() for arrays of circles and segments."""
+    dx = pos2[:, 0] - pos1[:, 0]
+    dy = pos2[:, 1] - pos1[:, 1]
+    px = pos1[:, 0]
+    py = pos1[:, 1]
+    cx = center[:, 0]
+    cy = center[:, 1]
+    a = _square(dx) + _square(dy)
+    b = 2 * (dx * px - dx * cx + dy * py - dy * cy)
+    c = (
+        -2 * cx * px
+        - 2 * cy * py
+        + _square(px)
+        + _square(py)
+        + _square(cx)
+        + _square(cy)
+        - _square(r)
+    )
+    D = _square(b) - 4 * a * c
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        root = numpy.sqrt(D)
+        alpha = (-b + root) / (2 * a)
+        alpha = numpy.where(alpha > 1, (-b - root) / (2 * a), alpha)
+    alpha = alpha - 0.05
+    pos = numpy.column_stack((px + alpha * dx, py + alpha * dy))
+    pos[D < 0] = (4000.0, 3000.0)
+    return pos
+
+
+def collidepoint_many(rect, pos):
+    """collidepoint() for an (n, 2) array of positions."""
+    with numpy.errstate(invalid="ignore"):
+        x = numpy.trunc(pos[:, 0])
+        y = numpy.trunc(pos[:, 1])
+        return (
+            (rect[0] <= x)
+            & (x < rect[0] + rect[2])
+            & (rect[1] <= y)
+            & (y < rect[1] + rect[3])
+        )
+
+
+def in_range_many(pos):
+    return collidepoint_many(RANGE_RECT, pos)
+
+
+def visible_many(pos):
+    return collidepoint_many(VIEW_RECT, pos)
+
+
+def accelerate_many(pos, v, bodies):
+    """
+    accelerate() for an (n, 2) array of positions and velocities.
+
+    All n x bodies accelerations are computed in one go, they are then
+    subtracted body by body so the rounding matches the scalar version.
+    """
+    bodies = body_arrays(bodies)
+    delta = pos[:, numpy.newaxis, :] - bodies.pos[numpy.newaxis, :, :]
+    d = _square(delta[:, :, 0]) + _square(delta[:, :, 1])
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        root = d * numpy.sqrt(d)
+        a = (
+            Settings.g
+            * bodies.mass[numpy.newaxis, :, numpy.newaxis]
+            * delta
+            / root[:, :, numpy.newaxis]
+        )
+    a[d == 0] = (10000, 10000)
+    v = v.copy()
+    for i in range(len(bodies.mass)):
+        v -= a[:, i]
+    return v
+
+
+def collide_many(last_pos, pos, bodies, index=None):
+    """
+    collide() for arrays of segments.
+
+    @param index: optional spatial.BodyGrid, see collide()
+
+    @return: (outcome, impact_pos) arrays. impact_pos rows are only
+             meaningful where outcome is not FLYING.
+    """
+    bodies = body_arrays(bodies)
+    impact_pos = pos.copy()
+    outcome = numpy.full(len(pos), FLYING)
+    if len(bodies.mass) == 0:
+        return (outcome, impact_pos)
+    limit = numpy.where(bodies.blackhole, bodies.mass, _square(bodies.radius))
+    if index is None:
+        delta = pos[:, numpy.newaxis, :] - bodies.pos[numpy.newaxis, :, :]
+        d = _square(delta[:, :, 0]) + _square(delta[:, :, 1])
+        hits = d <= limit
+        hit = hits.any(axis=1)
+        # The first body in the list wins, like in collide().
+        first = hits.argmax(axis=1)
+    else:
+        near = index.near_many(pos)
+        if near.shape[1] == 0:
+            return (outcome, impact_pos)
+        # Candidates are in body order, so the first one hit still wins.
+        valid = near >= 0
+        near = numpy.where(valid, near, 0)
+        delta = pos[:, numpy.newaxis, :] - bodies.pos[near]
+        d = _square(delta[:, :, 0]) + _square(delta[:, :, 1])
+        hits = valid & (d <= limit[near])
+        hit = hits.any(axis=1)
+        first = near[numpy.arange(len(pos)), hits.argmax(axis=1)]
+    blackhole = hit & bodies.blackhole[first]
+    planet = hit & ~bodies.blackhole[first]
+    outcome[blackhole] = HIT_BLACKHOLE
+    outcome[planet] = HIT_PLANET
+    impact_pos[blackhole] = bodies.pos[first[blackhole]]
+    if planet.any():
+        j = first[planet]
+        impact_pos[planet] = get_intersect_many(
+            bodies.pos[j], bodies.radius[j], last_pos[planet], pos[planet]
+        )
+    return (outcome, impact_pos)
+
+
+def bounce_many(last_pos, pos, v):
+    """bounce() for arrays of shots, returns new (pos, v) arrays."""
+    pos = pos.copy()
+    v = v.copy()
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        m = pos[:, 0] > 799
+        d = pos[m, 0] - last_pos[m, 0]
+        pos[m, 1] = (
+            last_pos[m, 1] + (pos[m, 1] - last_pos[m, 1]) * (799 - last_pos[m, 0]) / d
+        )
+        pos[m, 0] = 799
+        v[m, 0] = -v[m, 0]
+        m = pos[:, 0] < 0
+        d = last_pos[m, 0] - pos[m, 0]
+        pos[m, 1] = last_pos[m, 1] + (pos[m, 1] - last_pos[m, 1]) * last_pos[m, 0] / d
+        pos[m, 0] = 0
+        v[m, 0] = -v[m, 0]
+        m = pos[:, 1] > 599
+        d = pos[m, 1] - last_pos[m, 1]
+        pos[m, 0] = (
+            last_pos[m, 0] + (pos[m, 0] - last_pos[m, 0]) * (599 - last_pos[m, 1]) / d
+        )
+        pos[m, 1] = 599
+        v[m, 1] = -v[m, 1]
+        m = pos[:, 1] < 0
+        d = last_pos[m, 1] - pos[m, 1]
+        pos[m, 0] = last_pos[m, 0] + (pos[m, 0] - last_pos[m, 0]) * last_pos[m, 1] / d
+        pos[m, 1] = 0
+        v[m, 1] = -v[m, 1]
+    return (pos, v)
+
+
+def substeps_many(pos, bodies):
+    """substeps() for an (n, 2) array of positions."""
+    bodies = body_arrays(bodies)
+    if len(bodies.mass) == 0:
+        return numpy.ones(len(pos), dtype=int)
+    delta = pos[:, numpy.newaxis, :] - bodies.pos[numpy.newaxis, :, :]
+    d = _square(delta[:, :, 0]) + _square(delta[:, :, 1])
+    slowest = (d * numpy.sqrt(d) / (Settings.g * bodies.mass)).min(axis=1)
+    with numpy.errstate(divide="ignore"):
+        n = numpy.ceil(1 / (Settings.LEAPFROG_ETA * numpy.sqrt(slowest) + 1e-9))
+    return numpy.clip(n, 1, Settings.LEAPFROG_MAX_SUBSTEPS).astype(int)
+
+
+def leapfrog_many(pos, v, bodies, field=None):
+    """leapfrog() for arrays of shots, each with its own number of substeps."""
+    n = substeps_many(pos, bodies)
+    dt = (1.0 / n)[:, numpy.newaxis]
+    pos = pos.copy()
+    v = v.copy()
+    for k in range(n.max()):
+        m = k < n
+        pos[m] += 0.5 * dt[m] * v[m]
+        zero = numpy.zeros_like(pos[m])
+        if field is None:
+            a = accelerate_many(pos[m], zero, bodies)
+        else:
+            a = field.accelerate_many(pos[m], zero)
+        v[m] += dt[m] * a
+        pos[m] += 0.5 * dt[m] * v[m]
+    return (pos, v)
+
+
+def escaping_many(pos, v, bodies):
+    """escaping() for arrays of positions and velocities."""
+    bodies = body_arrays(bodies)
+    result = ~visible_many(pos)
+    pos = pos[result]
+    v = v[result]
+    delta = pos[:, numpy.newaxis, :] - bodies.pos[numpy.newaxis, :, :]
+    d = delta[:, :, 0] * delta[:, :, 0] + delta[:, :, 1] * delta[:, :, 1]
+    left, top, w, h = VIEW_RECT
+    far_x = numpy.maximum(bodies.pos[:, 0] - left, left + w - bodies.pos[:, 0])
+    far_y = numpy.maximum(bodies.pos[:, 1] - top, top + h - bodies.pos[:, 1])
+    away = (delta * v[:, numpy.newaxis, :]).sum(axis=2) > 0
+    far = d > far_x * far_x + far_y * far_y
+    energy = 0.5 * (v[:, 0] * v[:, 0] + v[:, 1] * v[:, 1])
+    with numpy.errstate(divide="ignore"):
+        for i in range(len(bodies.mass)):
+            energy -= Settings.g * bodies.mass[i] / numpy.sqrt(d[:, i])
+    result[result] = (away & far).all(axis=1) & (energy > 0)
+    return result
+
+
+def step_many(pos, v, bodies, bouncing=False, field=None, integrator=EULER, index=None):
+    """
+    step() for an (n, 2) array of positions and velocities.
+
+    @return: (outcome, pos, v, impact_pos) arrays, see step()
+    """
+    bodies = body_arrays(bodies)
+    last_pos = pos
+    if integrator == LEAPFROG:
+        pos, v = leapfrog_many(pos, v, bodies, field)
+    else:
+        if field is None:
+            v = accelerate_many(pos, v, bodies)
+        else:
+            v = field.accelerate_many(pos, v)
+        pos = pos + v
+
+    outcome, impact_pos = collide_many(last_pos, pos, bodies, index)
+    outcome[~in_range_many(pos)] = OUT_OF_RANGE
+    hit = (outcome == HIT_PLANET) | (outcome == HIT_BLACKHOLE)
+    pos[hit] = impact_pos[hit]
+
+    if bouncing:
+        flying = outcome == FLYING
+        bounced_pos, bounced_v = bounce_many(last_pos[flying], pos[flying], v[flying])
+        pos[flying] = bounced_pos
+        v[flying] = bounced_v
+    return (outcome, pos, v, impact_pos)
+
+
+def launch_velocity_many(angle, power):
+    """launch_velocity() for arrays of angles and powers."""
+    angle = numpy.radians(angle)
+    return numpy.stack(
+        (0.1 * power * numpy.sin(angle), -0.1 * power * numpy.cos(angle)), axis=-1
+    )
+
+
+def launch_point_many(center, d, angle):
+    """launch_point() for an array of angles."""
+    angle = numpy.radians(angle)
+    return numpy.stack(
+        (center[0] + d * numpy.sin(angle), center[1] - d * numpy.cos(angle)), axis=-1
+    )
+
+
+def ship_arrays(ships, shape):
+    """
+    Broadcast an array of Ships to shape and flatten it.
+
+    @rtype: ShipArrays
+    """
+    ships = numpy.broadcast_to(ships, shape).reshape(-1)
+    rects = numpy.array([ship.rect for ship in ships], dtype=float)
+    return ShipArrays(rects.reshape(len(ships), 4), ships)
+
+
+def hit_ships_many(ships, last_pos, pos, shots=None):
+    """
+    hit_ships() for arrays of shots.
+
+    Only segments whose bounding box touches a ship's rect are swept, for
+    everything else the ships cost a couple of comparisons.
+
+    @param ships: (ship 1, ship 2), either may be None, a Ship or
+                  ShipArrays
+    @param shots: the rows of ShipArrays the shots belong to, default all
+
+    @return: (outcome, pos) arrays, pos rows only matter for hits
+    """
+    if shots is None:
+        shots = numpy.arange(len(pos))
+    outcome = numpy.full(len(last_pos), FLYING)
+    impact_pos = pos.copy()
+    low = numpy.minimum(last_pos, pos)
+    high = numpy.maximum(last_pos, pos)
+    near = numpy.zeros(len(pos), dtype=bool)
+    for ship in ships:
+        if ship is None:
+            continue
+        if isinstance(ship, ShipArrays):
+            left, top, w, h = ship.rects[shots].T
+        else:
+            left, top, w, h = ship.rect
+        near |= (
+            (high[:, 0] >= left)
+            & (low[:, 0] < left + w)
+            & (high[:, 1] >= top)
+            & (low[:, 1] < top + h)
+        )
+    for k in numpy.flatnonzero(near):
+        pair = tuple(
+            ship.ships[shots[k]] if isinstance(ship, ShipArrays) else ship
+            for ship in ships
+        )
+        ship, hit = hit_ships(pair, tuple(last_pos[k]), tuple(pos[k]))
+        if ship != FLYING:
+            outcome[k] = ship
+            impact_pos[k] = hit
+    return (outcome, impact_pos)
+
+
+ShotResults = namedtuple("ShotResults", "outcome impact_pos ticks miss")
+ShotResults.__doc__ = """Outcome code, final (x, y) position and number of
+ticks of every shot of a simulate_many() call, and how far it missed the
+target if one was given."""
+
+
+def simulate_many(
+    bodies,
+    pos,
+    angles,
+    powers,
+    ships=None,
+    max_flight=None,
+    bouncing=None,
+    max_ticks=None,
+    field=None,
+    integrator=None,
+    index=None,
+    escape=None,
+    target=None,
+):
+    """
+    Fly a whole batch of shots in lock-step.
+
+    angles, powers and pos are broadcast against each other, so passing
+    angles[:, None] and powers[None, :] evaluates the full angle x power
+    grid. The results have the broadcast shape. Every shot ends exactly
+    like simulate() would end it.
+
+    @param bodies: list of Bodies or Planets, or BodyArrays
+    @param pos: launch point(s), shape (..., 2), see launch_point_many()
+    @param angles: launch angles in degrees, as in Player.get_angle
+    @param powers: launch powers, as in Player.get_power
+    @param ships: optional (ship 1, ship 2) pair of Ships. Either may also
+                  be an array of Ships, broadcast like angles, to give
+                  every shot its own, e.g. see Player.get_ships
+    @param field: optional gravity.GravityField, see step()
+    @param integrator: EULER or LEAPFROG, default Settings.INTEGRATOR
+    @param index: optional spatial.BodyGrid, see step()
+    @param escape: whether to stop escaping() shots, see simulate()
+    @param target: optional (x, y) point to measure the miss distance to.
+                   That is the distance of the closest approach, signed by
+                   the side the target was on as seen along the flight
+                   (positive on the right), so it changes sign when a
+                   sweep over angle or power moves the shot across the
+                   target. NaN without a target.
+
+    @rtype: ShotResults
+    """
+    if max_flight is None:
+        max_flight = Settings.MAX_FLIGHT
+    if bouncing is None:
+        bouncing = Settings.BOUNCE
+    if max_ticks is None:
+        max_ticks = 2 * max_flight
+    if integrator is None:
+        integrator = Settings.INTEGRATOR
+    if escape is None:
+        escape = Settings.ESCAPE_DETECTION
+    bodies = body_arrays(bodies)
+
+    angles, powers = numpy.broadcast_arrays(
+        numpy.asarray(angles, dtype=float), numpy.asarray(powers, dtype=float)
+    )
+    pos = numpy.asarray(pos, dtype=float)
+    shape = numpy.broadcast_shapes(angles.shape, pos.shape[:-1])
+    n = math.prod(shape)
+    angles = numpy.broadcast_to(angles, shape).reshape(n)
+    powers = numpy.broadcast_to(powers, shape).reshape(n)
+    pos = numpy.broadcast_to(pos, shape + (2,)).reshape(n, 2).copy()
+    v = launch_velocity_many(angles, powers)
+    if ships is not None:
+        ships = tuple(
+            ship_arrays(ship, shape) if isinstance(ship, numpy.ndarray) else ship
+            for ship in ships
+        )
+
+    outcome = numpy.full(n, FLYING)
+    impact_pos = pos.copy()
+    ticks = numpy.zeros(n, dtype=int)
+    miss = numpy.full(n, numpy.nan)
+    if target is not None:
+        closest = numpy.full(n, numpy.inf)
+        side = numpy.full(n, numpy.nan)
+
+    # Indices of the shots still in flight, the arrays below only hold those.
+    active = numpy.arange(n)
+    tick = 0
+    while len(active):
+        tick += 1
+        last_pos = pos
+        result, pos, v, impact = step_many(
+            pos, v, bodies, bouncing, field, integrator, index
+        )
+        if ships is not None:
+            ship, ship_pos = hit_ships_many(ships, last_pos, pos, active)
+            hit = ship != FLYING
+            result[hit] = ship[hit]
+            pos[hit] = ship_pos[hit]
+            impact[hit] = ship_pos[hit]
+        if escape and (max_flight - tick) % Settings.ESCAPE_INTERVAL == 0:
+            flying = numpy.flatnonzero(result == FLYING)
+            lost = flying[escaping_many(pos[flying], v[flying], bodies)]
+            result[lost] = ESCAPED
+        lost = (result == OUT_OF_RANGE) | (result == ESCAPED)
+        impact[lost] = pos[lost]
+        if max_flight - tick < 0 or tick >= max_ticks:
+            timeout = result == FLYING
+            if tick < max_ticks:
+                timeout &= ~visible_many(pos)
+            result[timeout] = TIMEOUT
+            impact[timeout] = pos[timeout]
+
+        if target is not None:
+            dx = pos[:, 0] - target[0]
+            dy = pos[:, 1] - target[1]
+            d = numpy.hypot(dx, dy)
+            closer = d < closest
+            closest[closer] = d[closer]
+            with numpy.errstate(invalid="ignore", divide="ignore"):
+                # v x (target - pos), positive with the target on the
+                # right on screen, where y points down.
+                cross = v[closer, 1] * dx[closer] - v[closer, 0] * dy[closer]
+                side[closer] = numpy.sign(cross)
+
+        done = result != FLYING
+        outcome[active[done]] = result[done]
+        impact_pos[active[done]] = impact[done]
+        ticks[active[done]] = tick
+        if target is not None:
+            miss[active[done]] = closest[done] * side[done]
+            closest = closest[~done]
+            side = side[~done]
+
+        active = active[~done]
+        pos = pos[~done]
+        v = v[~done]
+
+    return ShotResults(
+        outcome.reshape(shape),
+        impact_pos.reshape(shape + (2,)),
+        ticks.reshape(shape),
+        miss.reshape(shape),
+    )
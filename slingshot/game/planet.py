@@ -28,6 +28,8 @@ import pygame
 
 from game.settings import *
 from game.general import *
+from game import layout
+from game import physics
 
 
 class Planet(pygame.sprite.Sprite):
@@ -57,47 +59,18 @@ class Planet(pygame.sprite.Sprite):
         self.type = "Planet"
 
         if n is None and planets is not None:
-            unique = False
-            while not unique:
-                unique = True
-                self.n = randint(1, 8)
-                for p in planets:
-                    if self.n == p.get_n():
-                        unique = False
+            self.n = layout.free_number([p.get_n() for p in planets], 1, 8)
         else:
             self.n = n
 
-        filename = get_data_path(f"planet_{self.n}.png")
+        filename = get_data_path(f"planet_{layout.texture(self.n)}.png")
         self.orig, self.rect = load_image(filename, (0, 0, 0))
         self.image = self.orig
 
         if radius is None or mass is None or pos is None:
-            positioned = False
-            while not positioned:
-                self.mass = randint(8, 512)
-                # radius is between 25 and 100 when mass is
-                # between 8 and 512
-                self.r = self.mass ** (1.0 / 3.0) * 12.5
-                self.pos = (
-                    randint(
-                        Settings.PLANET_SHIP_DISTANCE + round(self.r),
-                        800 - Settings.PLANET_SHIP_DISTANCE - round(self.r),
-                    ),
-                    randint(
-                        Settings.PLANET_EDGE_DISTANCE + round(self.r),
-                        600 - Settings.PLANET_EDGE_DISTANCE - round(self.r),
-                    ),
-                )
-                positioned = True
-                for p in planets:
-                    d = math.sqrt(
-                        (self.pos[0] - p.get_pos()[0]) ** 2
-                        + (self.pos[1] - p.get_pos()[1]) ** 2
-                    )
-                    if d < (self.r + p.get_radius()) * 1.5 + 0.1 * (
-                        self.mass + p.get_mass()
-                    ):
-                        positioned = False
+            self.r, self.mass, self.pos = layout.place(
+                [(p.get_radius(), p.get_mass(), p.get_pos()) for p in planets]
+            )
         else:
             self.mass = mass
             self.r = radius
@@ -118,6 +91,8 @@ class Planet(pygame.sprite.Sprite):
         self.fade_image.set_alpha(255)
         self.fade_image.convert()
 
+        self.body = physics.body_from_sprite(self)
+
     def get_n(self):
         return self.n
 
@@ -157,54 +132,19 @@ class Blackhole(Planet):
         self.rect = self.image.get_rect()
 
         if n is None and planets is not None:
-            unique = False
-            while not unique:
-                unique = True
-                self.n = randint(
-                    Settings.MAX_PLANETS + 1,
-                    Settings.MAX_PLANETS + Settings.MAX_BLACKHOLES + 1,
-                )
-                for p in planets:
-                    if self.n == p.get_n():
-                        unique = False
+            self.n = layout.free_number(
+                [p.get_n() for p in planets],
+                Settings.MAX_PLANETS + 1,
+                Settings.MAX_PLANETS + Settings.MAX_BLACKHOLES + 1,
+            )
         else:
             self.n = n
 
         if radius is None or mass is None or pos is None:
-            positioned = False
-            while not positioned:
-                # We can't accurately represent blackholes in
-                # this game. According to my (feeble)
-                # understanding of the Schwarzschild radius, to
-                # have a radius of 1m and be a black hole, we'd
-                # have to have a mass of 6.73*10^26kg. At least
-                # 600 is still 6 times larger than the size of
-                # our largest planet.
-                self.mass = randint(600, 700)
-                self.r = 1  # radius
-                # Slightly more distance from the sides than
-                # planets because of our massive gravit.
-                # field.
-                self.pos = (
-                    randint(
-                        3 * Settings.PLANET_SHIP_DISTANCE + round(self.r),
-                        800 - 3 * Settings.PLANET_SHIP_DISTANCE - round(self.r),
-                    ),
-                    randint(
-                        3 * Settings.PLANET_EDGE_DISTANCE + round(self.r),
-                        600 - 3 * Settings.PLANET_EDGE_DISTANCE - round(self.r),
-                    ),
-                )
-                positioned = True
-                for p in planets:
-                    d = math.sqrt(
-                        (self.pos[0] - p.get_pos()[0]) ** 2
-                        + (self.pos[1] - p.get_pos()[1]) ** 2
-                    )
-                    if d < (self.r + p.get_radius()) * 1.5 + 0.1 * (
-                        self.mass + p.get_mass()
-                    ):
-                        positioned = False
+            self.r, self.mass, self.pos = layout.place(
+                [(p.get_radius(), p.get_mass(), p.get_pos()) for p in planets],
+                blackhole=True,
+            )
         else:
             self.mass = mass
             self.r = radius
@@ -214,6 +154,8 @@ class Blackhole(Planet):
         self.rect = self.orig.get_rect()
         self.rect.center = self.pos
 
+        self.body = physics.body_from_sprite(self)
+
     def fade(self, f):
         """Don't mess with our alpha, we're invilible!"""
         pass
@@ -23,17 +23,125 @@
 # Copyright (C) 2010 Ryan Kavanagh <ryanakca@kubuntu.org>
 
 import math
+import threading
+from collections import OrderedDict
 
 from random import randint
+import numpy
 import pygame
 
 from game.settings import *
 from game.general import *
+from game import ai
+from game import physics
+from game import text
+from game import animation
+
+# The sizes of an exploding ship, frame by frame
+EXPLOSION = tuple((s, s) for s in (e * (6 - e) * 100 / 9 for e in range(1, 7)))
+
+
+def opaque(image):
+    """Pixel mask of image, opaque means anything but (0, 0, 0, 0)."""
+    rgb = pygame.surfarray.array3d(image)
+    alpha = pygame.surfarray.array_alpha(image)
+    return (rgb.any(axis=2) | (alpha != 0)).T
+
+
+class Rotations:
+    """
+    The rotated images of a ship and their collision masks.
+
+    Angles are rounded to multiples of Settings.ROTATION_STEP degrees and
+    each image is rendered the first time its angle comes up; after that,
+    turning the ship is a dictionary lookup. The last size images are
+    kept, with their masks. The computer player asks for masks from its
+    worker thread, hence the lock.
+    """
+
+    def __init__(self, strip, step=None, size=None):
+        """
+        @param strip: the ship's eight 40x33 frames, 45 degrees apart
+        @type strip: pygame.Surface
+        @param step: degrees between two cached angles
+        @type step: float
+        @param size: how many images to keep, default
+                     Settings.ROTATION_CACHE_SIZE
+        @type size: int
+        """
+        if step is None:
+            step = Settings.ROTATION_STEP
+        if size is None:
+            size = Settings.ROTATION_CACHE_SIZE
+        self.strip = strip
+        self.count = max(1, round(360 / step))
+        self.size = size
+        self.images = OrderedDict()
+        self.masks = {}
+        self.lock = threading.Lock()
+
+    def key(self, rel_rot):
+        """The cache key of the angle rel_rot."""
+        return round(rel_rot * self.count / 360) % self.count
+
+    def image(self, key):
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+                return image
+            image = self.images[key] = self.render(key * 360 / self.count)
+            if len(self.images) > self.size:
+                old, _ = self.images.popitem(last=False)
+                self.masks.pop(old, None)
+            return image
+
+    def mask(self, key):
+        image = self.image(key)
+        with self.lock:
+            mask = self.masks.get(key)
+            if mask is None:
+                mask = self.masks[key] = opaque(image)
+            return mask
+
+    def render(self, rel_rot):
+        """Blend the two frames nearest to rel_rot and rotate the result."""
+        img1 = round((rel_rot + 22.5) / 45 - 0.49) % 8
+        img2 = round(rel_rot / 45 - 0.49) % 8
+        if img1 == img2 or img1 == -img2:
+            img2 = (img2 + 1) % 8
+            f = (rel_rot - img1 * 45.0) / 45.0
+        else:
+            f = ((img2 + 1) * 45.0 - rel_rot) / 45.0
+
+        rect1 = pygame.Rect(img1 * 40, 0, 40, 33)
+        rect2 = pygame.Rect(img2 * 40, 0, 40, 33)
+        image1 = self.strip.subsurface(rect1)
+        image2 = self.strip.subsurface(rect2)
+        image1 = image1.convert_alpha()
+        image2 = image2.convert_alpha()
+
+        tmp = pygame.Surface((40, 33))
+        tmp = tmp.convert_alpha()
+        tmp.blit(image2, (0, 0))
+        tmp = tmp.convert()
+        tmp.set_alpha(round(255.0 * f))
+        tmp.set_colorkey((0, 0, 0))
+        tmp = tmp.convert_alpha()
+
+        image1.blit(tmp, (0, 0))
+
+        return pygame.transform.rotozoom(image1, -rel_rot, 1.0)
+
 
+class Player(pygame.sprite.DirtySprite):
+    # Humans have no level, see AIPlayer
+    level = None
+    # Rotations of each ship image, kept across rounds
+    rotation_cache = {}
 
-class Player(pygame.sprite.Sprite):
     def __init__(self, n):
-        pygame.sprite.Sprite.__init__(self)  # call Sprite intializer
+        pygame.sprite.DirtySprite.__init__(self)  # call Sprite intializer
         self.player = n
         self.init()
         self.score = 0
@@ -43,11 +151,12 @@ class Player(pygame.sprite.Sprite):
         self.shot = False
         self.attempts = 0
         self.e = 0
-        self.exp, self.rect = load_image("explosion.png", (0, 0, 0))
+        self.rect = animation.image("explosion.png").get_rect()
 
         if self.player == 1:
             self.angle = 90
-            self.orig, self.rect = load_image("red_ship.png", (0, 0, 0))
+            ship = "red_ship.png"
+            self.orig = animation.image(ship)
             self.color = (209, 170, 133)
             self.rect = pygame.Rect(0, 0, 40, 33)
             if y_coord is None:
@@ -58,7 +167,8 @@ class Player(pygame.sprite.Sprite):
             self.image = self.orig.subsurface(0, 0, 40, 33)
         elif self.player == 2:
             self.angle = 270
-            self.orig, self.rect = load_image("blue_ship.png", (0, 0, 0))
+            ship = "blue_ship.png"
+            self.orig = animation.image(ship)
             self.color = (132, 152, 192)
             self.rect = pygame.Rect(0, 0, 40, 33)
             if y_coord is None:
@@ -70,8 +180,19 @@ class Player(pygame.sprite.Sprite):
         else:
             self.orig = None
 
+        if self.orig is not None:
+            if ship not in Player.rotation_cache:
+                Player.rotation_cache[ship] = Rotations(self.orig)
+            self.rotations = Player.rotation_cache[ship]
+
         self.rel_rot = 0.01
 
+        # Collision mask of our image, and its key in self.rotations
+        # (None while the image is not one of the rotations)
+        self.mask = None
+        self.mask_key = None
+        self.dirty = 1
+
         if Settings.FIXED_POWER:
             self.power = Settings.POWER
 
@@ -105,39 +226,12 @@ class Player(pygame.sprite.Sprite):
         #     self.rect = self.image.get_rect(center = center)
 
         center = self.rect.center
-        # print("center0: (%d,%d)" %(self.rect.center[0], self.rect.center[1]))
-
-        img1 = round((self.rel_rot + 22.5) / 45 - 0.49) % 8
-        img2 = round(self.rel_rot / 45 - 0.49) % 8
-        if img1 == img2 or img1 == -img2:
-            img2 = (img2 + 1) % 8
-            f = (self.rel_rot - img1 * 45.0) / 45.0
-        else:
-            f = ((img2 + 1) * 45.0 - self.rel_rot) / 45.0
-
-        rect1 = pygame.Rect(img1 * 40, 0, 40, 33)
-        rect2 = pygame.Rect(img2 * 40, 0, 40, 33)
-        image1 = self.orig.subsurface(rect1)
-        image2 = self.orig.subsurface(rect2)
-        image1 = image1.convert_alpha()
-        image2 = image2.convert_alpha()
-
-        tmp = pygame.Surface((40, 33))
-        tmp = tmp.convert_alpha()
-        tmp.blit(image2, (0, 0))
-        tmp = tmp.convert()
-        tmp.set_alpha(round(255.0 * f))
-        tmp.set_colorkey((0, 0, 0))
-        tmp = tmp.convert_alpha()
-
-        image1.blit(tmp, (0, 0))
-
-        # self.image = pygame.transform.rotate(image1, -self.rel_rot)
-        self.image = pygame.transform.rotozoom(image1, -self.rel_rot, 1.0)
+        self.mask_key = self.rotations.key(self.rel_rot)
+        self.image = self.rotations.image(self.mask_key)
         self.rect = self.image.get_rect()
-        # print("center1: (%d,%d)" %(self.rect.center[0], self.rect.center[1]))
         self.rect.center = center
-        # print("center2: (%d,%d)" %(self.rect.center[0], self.rect.center[1]))
+        self.mask = None
+        self.dirty = 1
 
     def change_power(self, p):
         if not Settings.FIXED_POWER:
@@ -155,16 +249,40 @@ class Player(pygame.sprite.Sprite):
 
     def get_launchpoint(self):
         if Settings.ROTATE:
-            return (
-                self.rect.center[0] + self.d * math.sin(math.radians(self.angle)),
-                self.rect.center[1] - self.d * math.cos(math.radians(self.angle)),
-            )
+            return physics.launch_point(self.rect.center, self.d, self.angle)
         else:
             if self.player == 1:
                 return (self.rect.midright[0] + 1, self.rect.midright[1])
             if self.player == 2:
                 return (self.rect.midleft[0] - 1, self.rect.midleft[1])
 
+    def get_launchpoints(self, angles):
+        """get_launchpoint for an array of angles, as used by simulate_many."""
+        if Settings.ROTATE:
+            return physics.launch_point_many(self.rect.center, self.d, angles)
+        else:
+            return numpy.broadcast_to(
+                self.get_launchpoint(), numpy.shape(angles) + (2,)
+            )
+
+    def get_ship(self):
+        """Our current rect and opaque pixels, for the headless physics."""
+        if self.mask is None:
+            if self.mask_key is None:
+                self.mask = opaque(self.image)
+            else:
+                self.mask = self.rotations.mask(self.mask_key)
+        return physics.Ship(tuple(self.rect), self.mask)
+
+    def get_ships(self, angles):
+        """get_ship for an array of angles, as if we had turned to each."""
+        ships = numpy.empty(numpy.shape(angles), dtype=object)
+        for i, angle in numpy.ndenumerate(angles):
+            key = self.rotations.key(self.rel_rot + angle - self.angle)
+            rect = self.rotations.image(key).get_rect(center=self.rect.center)
+            ships[i] = physics.Ship(tuple(rect), self.rotations.mask(key))
+        return ships
+
     def get_rect_y_coord(self):
         if self.player == 1:
             return self.rect.midright[1]
@@ -172,41 +290,52 @@ class Player(pygame.sprite.Sprite):
             return self.rect.midleft[1]
 
     def draw_info(self, screen):
-        txt = Settings.font.render("Angle: %3.2f" % (self.angle), 1, (255, 255, 255))
+        txt = text.cache.render(
+            Settings.font, "Angle: %3.2f" % (self.angle), 1, (255, 255, 255)
+        )
         rect = txt.get_rect()
         rect.topleft = (290, 5)
         screen.blit(txt, rect.topleft)
 
-        txt = Settings.font.render("Power: %3.1f" % (self.power), 1, (255, 255, 255))
+        txt = text.cache.render(
+            Settings.font, "Power: %3.1f" % (self.power), 1, (255, 255, 255)
+        )
         rect = txt.get_rect()
         rect.topleft = (403, 5)
         screen.blit(txt, rect.topleft)
 
     def draw_status(self, screen):
         if self.player == 1:
-            txt = Settings.font.render("Player 1  --  %d" % (self.score), 1, self.color)
+            txt = text.cache.render(
+                Settings.font, "Player 1  --  %d" % (self.score), 1, self.color
+            )
             rect = txt.get_rect()
             rect.topleft = (5, 5)
         else:
-            txt = Settings.font.render("%d  --  Player 2" % (self.score), 1, self.color)
+            txt = text.cache.render(
+                Settings.font, "%d  --  Player 2" % (self.score), 1, self.color
+            )
             rect = txt.get_rect()
             rect.topright = (794, 5)
         screen.blit(txt, rect.topleft)
 
     def update_explosion(self):
         self.e = self.e + 1
-        s = self.e * (6 - self.e) * 100 / 9
-        if s >= 0:
-            self.image = pygame.transform.scale(self.exp, (s, s))
+        frames = animation.scaled("explosion.png", EXPLOSION)
+        if self.e <= len(frames):
+            self.image = frames[self.e - 1]
+            self.mask = None
+            self.mask_key = None
             pos = self.rect.center
             self.rect = self.image.get_rect()
             self.rect.center = pos
+            self.dirty = 1
 
     def draw_line(self, screen):
-        """Draws the aiming line out of the ship's gun."""
+        """Draws the aiming line out of the ship's gun, returns its area."""
         (sx, sy) = self.get_launchpoint()
 
-        pygame.draw.aaline(
+        rect = pygame.draw.aaline(
             screen,
             self.color,
             (sx, sy),
@@ -215,6 +344,8 @@ class Player(pygame.sprite.Sprite):
                 sy - self.power * math.cos(math.radians(self.angle)),
             ),
         )
+        # The rect aaline returns can miss the edge of the antialiasing.
+        return rect.inflate(4, 4)
 
     def draw(self, screen):
         center = self.rect.center
@@ -253,18 +384,11 @@ class Player(pygame.sprite.Sprite):
 
         self.image = pygame.transform.rotate(image2, self.rel_rot)
         self.rect = self.image.get_rect(center=center)
+        self.mask = None
+        self.mask_key = None
 
     def hit(self, pos):
-        if not self.rect.collidepoint(pos):
-            return False
-
-        x = int(round(pos[0] - self.rect.topleft[0]))
-        y = int(round(pos[1] - self.rect.topleft[1]))
-        if x <= 1 or y <= 1:
-            return False
-        x = x - 1
-        y = y - 1
-        if not self.image.get_at((x, y)) == (0, 0, 0, 0):
+        if physics.ship_hit(self.get_ship(), pos):
             self.shot = True
             return True
         else:
@@ -286,3 +410,67 @@ class Dummy(Player):
 
     def draw_info(self, screen):
         pass
+
+
+class AIPlayer(Player):
+    """
+    A computer player.
+
+    think() starts an ai.search() in a worker thread and hands out its
+    result once it is done, so the game keeps drawing while we think.
+    """
+
+    def __init__(self, n, level=None):
+        if level is None:
+            level = Settings.AI_LEVEL
+        self.level = level
+        # Searches of a turn we gave up on may still finish, their results
+        # are told apart by this number.
+        self.turn = 0
+        Player.__init__(self, n)
+
+    def init(self, y_coord=None):
+        Player.init(self, y_coord)
+        self.forget()
+
+    def forget(self):
+        """Drop the search in progress, if any."""
+        self.turn += 1
+        self.thread = None
+        self.aim = None
+
+    def think(self, bodies, ships, **kwargs):
+        """
+        Work out our next shot.
+
+        @param bodies: BodyArrays of the round
+        @param ships: (ship 1, ship 2) pair of Ships
+        @param kwargs: passed on to physics.simulate_many
+
+        @return: the ai.Aim once the search is done, None until then
+        """
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self.search, args=(self.turn, bodies, ships, kwargs)
+            )
+            self.thread.daemon = True
+            self.thread.start()
+            return None
+        if self.thread.is_alive() or self.aim is None:
+            return None
+        aim = self.aim
+        self.forget()
+        return aim
+
+    def search(self, turn, bodies, ships, kwargs):
+        aim = ai.search(
+            bodies,
+            self.get_launchpoints,
+            ships,
+            self.player,
+            ai.LEVELS[self.level],
+            turn=self.get_ships,
+            **kwargs,
+        )
+        if turn == self.turn:
+            self.aim = aim
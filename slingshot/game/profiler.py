@@ -0,0 +1,220 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""
+Per-frame timing of the game loop.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import numpy
+import pygame
+
+from game.settings import *
+
+# Waiting for the next frame, not counted in a frame's total
+IDLE = "idle"
+TOTAL = "total"
+PERCENTILES = (50, 90, 95, 99)
+
+
+class FrameProfiler:
+    """
+    Where the time of each frame goes.
+
+    The game calls lap(name) after each phase of its loop, which adds the
+    time since the previous lap to that phase of the current frame, and
+    frame() once per loop. Other numbers of a frame are recorded with
+    count(). The last Settings.PROFILE_FRAMES frames are kept for the
+    overlay and for export.
+    """
+
+    def __init__(self, frames=None):
+        if frames is None:
+            frames = Settings.PROFILE_FRAMES
+        self.frames = deque(maxlen=frames)
+        # Phase names, in the order they first showed up
+        self.phases = {}
+        self.counters = {}
+        self.current = {}
+        self.last = time.perf_counter()
+        self.visible = Settings.PROFILE
+        self.overlay = None
+        self.age = 0
+        # Name of the last export, shown under the overlay
+        self.exported = None
+
+    def lap(self, name):
+        """Add the time since the last lap to phase name."""
+        now = time.perf_counter()
+        self.current[name] = self.current.get(name, 0.0) + now - self.last
+        self.last = now
+
+    def count(self, name, value):
+        """Record value as counter name of the current frame."""
+        self.counters.setdefault(name)
+        self.current[name] = value
+
+    def frame(self):
+        """Close the current frame and start the next one."""
+        if self.current:
+            for name in self.current:
+                if name not in self.counters:
+                    self.phases.setdefault(name)
+            self.frames.append(self.current)
+            self.current = {}
+        self.last = time.perf_counter()
+        self.age += 1
+
+    def columns(self):
+        return list(self.phases) + [TOTAL] + list(self.counters)
+
+    def table(self, frames=None):
+        """
+        The frames as an array, one column per phase and counter.
+
+        @param frames: frames to use, default: all that were kept
+        @return: (frames, columns()) array, phases in milliseconds; phases
+                 and counters missing from a frame count as 0
+        """
+        if frames is None:
+            frames = self.frames
+        phases = list(self.phases)
+        names = phases + list(self.counters)
+        n = len(phases)
+        result = numpy.zeros((len(frames), len(names) + 1))
+        for row, frame in zip(result, frames):
+            row[:n] = [frame.get(name, 0.0) for name in phases]
+            row[n + 1 :] = [frame.get(name, 0) for name in self.counters]
+        result[:, :n] *= 1000
+        result[:, n] = result[:, :n].sum(axis=1)
+        if IDLE in self.phases:
+            result[:, n] -= result[:, phases.index(IDLE)]
+        return result
+
+    def summary(self, frames=None):
+        """
+        Mean, percentiles and maximum of every column, in milliseconds.
+
+        @return: {column: {"mean": ms, "p50": ms, ..., "max": ms}}
+        """
+        table = self.table(frames)
+        result = {}
+        if len(table) == 0:
+            return result
+        for name, column in zip(self.columns(), table.T):
+            stats = {"mean": float(column.mean())}
+            for p, value in zip(PERCENTILES, numpy.percentile(column, PERCENTILES)):
+                stats[f"p{p}"] = float(value)
+            stats["max"] = float(column.max())
+            result[name] = stats
+        return result
+
+    def export(self, path):
+        """
+        Write the kept frames to path.csv, and with a summary to path.json.
+
+        @return: the names of both files
+        """
+        columns = self.columns()
+        table = self.table()
+        with open(path + ".csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + columns)
+            for i, row in enumerate(table.tolist()):
+                writer.writerow([i] + [f"{ms:.3f}" for ms in row])
+        with open(path + ".json", "w") as f:
+            json.dump(
+                {
+                    "fps": Settings.FPS,
+                    "budget": 1000 / Settings.FPS,
+                    "columns": columns,
+                    "summary": self.summary(),
+                    "frames": numpy.round(table, 3).tolist(),
+                },
+                f,
+                indent=1,
+            )
+        self.exported = os.path.basename(path)
+        self.overlay = None
+        return path + ".csv", path + ".json"
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.overlay = None
+
+    def draw(self, screen):
+        """Draw the overlay, refreshed twice a second from the last second."""
+        if not self.visible:
+            return
+        if self.overlay is None or self.age >= Settings.FPS // 2:
+            self.overlay = self.render()
+            self.age = 0
+        if self.overlay is not None:
+            screen.blit(self.overlay, (10, 40))
+
+    def render(self):
+        frames = list(self.frames)[-Settings.FPS :]
+        summary = self.summary(frames)
+        if not summary:
+            return None
+        budget = 1000 / Settings.FPS
+        lines = [("ms", "p50", "p95", "max")]
+        # Leave out phases that round to nothing.
+        for name, s in summary.items():
+            if name in self.counters:
+                values = [f"{s[key] / 1000:.0f}k" for key in ("p50", "p95", "max")]
+            elif s["max"] >= 0.05 or name == TOTAL:
+                values = [f"{s[key]:.1f}" for key in ("p50", "p95", "max")]
+            else:
+                continue
+            lines.append((name, *values))
+        height = Settings.font.get_linesize()
+        rows = len(lines)
+        if self.exported is not None:
+            rows += 1
+        result = pygame.Surface((300, height * rows + 10))
+        result.set_alpha(200)
+        for i, line in enumerate(lines):
+            color = (255, 255, 255)
+            if (
+                i > 0
+                and line[0] not in self.counters
+                and line[0] != IDLE
+                and float(line[2]) > budget
+            ):
+                color = (255, 80, 80)
+            y = 5 + i * height
+            txt = Settings.font.render(line[0], 1, color)
+            result.blit(txt, (5, y))
+            for x, value in zip((190, 240, 295), line[1:]):
+                txt = Settings.font.render(value, 1, color)
+                result.blit(txt, (x - txt.get_width(), y))
+        if self.exported is not None:
+            txt = Settings.font.render(
+                f"Saved {self.exported}.csv/.json", 1, (255, 255, 255)
+            )
+            result.blit(txt, (5, 5 + len(lines) * height))
+        return result
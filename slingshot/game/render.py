@@ -0,0 +1,188 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""
+Frame rendering, optionally with dirty rectangles.
+"""
+
+import pygame
+
+from game.settings import *
+
+
+def border(rect):
+    """The four one pixel wide edges of rect."""
+    x, y, w, h = rect
+    return [
+        pygame.Rect(x, y, w, 1),
+        pygame.Rect(x, y + h - 1, w, 1),
+        pygame.Rect(x, y, 1, h),
+        pygame.Rect(x + w - 1, y, 1, h),
+    ]
+
+
+class Canvas:
+    """
+    Stands in for a surface to blit to, and remembers where it blitted.
+    """
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.rects = []
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = self.surface.blit(source, dest, area, special_flags)
+        self.rects.append(rect)
+        return rect
+
+    def blits(self, blit_sequence, doreturn=1):
+        rects = self.surface.blits(blit_sequence, True)
+        self.rects.extend(rects)
+        if doreturn:
+            return rects
+
+    def mark(self, rect):
+        """Remember rect as drawn to, for drawing done behind our back."""
+        if rect is not None:
+            self.rects.append(pygame.Rect(rect))
+
+    def __getattr__(self, name):
+        return getattr(self.surface, name)
+
+
+class Renderer:
+    """
+    Draws the static layer and the ships, and presents finished frames.
+
+    The static layer is the backdrop, the planets and the trail, painted
+    by a callback. Without Settings.DIRTY_RECTS every frame is painted
+    from scratch and flipped. With it, the static layer is kept in a
+    surface of its own and the ships are DirtySprites in a LayeredDirty
+    group drawn over it. Everything else is drawn to a Canvas, and the
+    next frame repaints those areas from the static layer and the ships.
+    Only areas that changed are pushed to the display, unless they add
+    up to more than Settings.DIRTY_RECTS_MAX of it: then we flip.
+    """
+
+    def __init__(self, paint):
+        """
+        @param paint: draws the static layer onto the surface it is given
+        @type paint: function(pygame.Surface)
+        """
+        self.paint = paint
+        self.group = pygame.sprite.LayeredDirty()
+        # We choose between updating and flipping ourselves.
+        self.group.set_timing_threshold(float("inf"))
+        self.screen = None
+        self.static = None
+        self.key = None
+        # Areas of the static layer painted over since the last frame
+        self.stale = []
+        # Areas the last frame drew to outside of the group
+        self.drawn = []
+        self.updated = []
+        self.canvas = None
+        # Pixels pushed to the display by the last frame
+        self.pixels = 0
+
+    def invalidate(self):
+        """Repaint all of the next frame, for when the display was lost."""
+        self.key = None
+
+    def refresh(self, rect):
+        """The static layer changed within rect."""
+        if Settings.DIRTY_RECTS:
+            self.stale.append(pygame.Rect(rect))
+
+    def begin(self, screen, key, sprites):
+        """
+        Start a frame: draw the static layer and the ships on screen.
+
+        @param key: changes whenever the static layer as a whole does
+        @param sprites: the ships, DirtySprites
+        @return: Canvas to draw the rest of the frame on
+        @rtype: Canvas
+        """
+        self.canvas = Canvas(screen)
+        if not Settings.DIRTY_RECTS:
+            self.screen = None
+            self.paint(screen)
+            screen.blits([(s.image, s.rect) for s in sprites], False)
+            return self.canvas
+
+        if screen is not self.screen or self.static.get_size() != screen.get_size():
+            self.screen = screen
+            self.static = pygame.Surface(screen.get_size()).convert()
+            self.group.clear(screen, self.static)
+            self.key = None
+        if self.group.sprites() != list(sprites):
+            self.group.empty()
+            self.group.add(*sprites)
+            self.key = None
+
+        if key != self.key:
+            self.key = key
+            self.paint(self.static)
+            self.group.repaint_rect(screen.get_rect())
+        else:
+            for rect in self.stale:
+                self.static.set_clip(rect)
+                self.paint(self.static)
+            self.static.set_clip(None)
+            rects = self.stale + self.drawn
+            for rect in rects:
+                self.group.repaint_rect(rect)
+            # LayeredDirty draws a clean sprite once for every repainted
+            # area it is in, blending translucent pixels twice where they
+            # overlap; a dirty sprite is drawn once.
+            for sprite in sprites:
+                if sprite.rect.collidelist(rects) >= 0:
+                    sprite.dirty = 1
+        self.stale = []
+        self.updated = self.group.draw(screen)
+        return self.canvas
+
+    def present(self):
+        """
+        Show the frame.
+
+        @return: the number of pixels pushed to the display
+        """
+        screen = self.canvas.surface
+        bounds = screen.get_rect()
+        if not Settings.DIRTY_RECTS:
+            pygame.display.flip()
+            self.pixels = bounds.w * bounds.h
+            return self.pixels
+
+        self.drawn = []
+        for rect in self.canvas.rects:
+            rect = rect.clip(bounds)
+            if rect.w and rect.h:
+                self.drawn.append(rect)
+        rects = self.updated + self.drawn
+        self.pixels = sum(rect.w * rect.h for rect in rects)
+        if self.pixels > Settings.DIRTY_RECTS_MAX * bounds.w * bounds.h:
+            pygame.display.flip()
+            self.pixels = bounds.w * bounds.h
+        else:
+            pygame.display.update(rects)
+        return self.pixels
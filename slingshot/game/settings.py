@@ -42,9 +42,13 @@ class Settings:
     PARTICLE_10_MAXSPEED = 250  # 250 easy, 400-500 wild
     n_PARTICLES_5 = 20  # number of small particles originating from a big one
     n_PARTICLES_10 = 30  # number of big particles originating from explosion
-    # if both are too high, the game stalls on impact
 
     ROTATE = True
+    # Ship images are rendered for angles rounded to this many degrees,
+    # 0.05 is the finest step the keys can turn a ship by
+    ROTATION_STEP = 0.05
+    # How many of those images to keep per ship
+    ROTATION_CACHE_SIZE = 360
     BOUNCE = False
     FIXED_POWER = False
     PARTICLES = True
@@ -53,6 +57,43 @@ class Settings:
     POWER = 200
 
     MAX_FLIGHT = 750
+    # The overview of an off screen missile zooms in up to this many
+    # levels, each ZOOM_STEP times closer, as far as the missile allows
+    ZOOM_LEVELS = 4
+    ZOOM_STEP = 1.25
+    # Ticks per frame while the missile is off screen (or Tab is held)
+    FAST_FORWARD = 8
+
+    # Look gravity up in a per-round table instead of summing over planets
+    GRAVITY_FIELD = False
+    GRAVITY_FIELD_RESOLUTION = 8  # grid spacing in pixels
+    GRAVITY_FIELD_ERROR = 0.005  # max interpolation error in pixels/tick^2
+
+    # Approximate gravity with a Barnes-Hut tree from this many bodies on
+    # (0 never does); larger opening angles are faster and less accurate
+    BARNES_HUT_BODIES = 64
+    BARNES_HUT_THETA = 0.5
+
+    # "euler" reproduces the classic trajectories, "leapfrog" is more
+    # accurate on long orbits and close passes
+    INTEGRATOR = "euler"
+    LEAPFROG_ETA = 0.1  # fraction of the dynamical time per substep
+    LEAPFROG_MAX_SUBSTEPS = 16
+
+    # End shots that have left the screen for good, checked every
+    # ESCAPE_INTERVAL ticks
+    ESCAPE_DETECTION = True
+    ESCAPE_INTERVAL = 8
+
+    TRAJECTORY_CACHE_BYTES = 8 * 1024 * 1024
+
+    # Cell size of the per-round grid collision checks look bodies up in
+    BODY_GRID_CELL = 32
+
+    # Search budget of the computer player, see game.ai.LEVELS
+    AI_LEVEL = "medium"
+    # Shots after which a headless match (game.match) calls a round a draw
+    MATCH_MAX_SHOTS = 50
 
     MAX_PLANETS = 4
     MAX_BLACKHOLES = 0
@@ -71,6 +112,18 @@ class Settings:
     )
     KEY_DELAY = 250
 
+    # Only repaint and push the parts of the screen that changed, unless
+    # they are more than this fraction of it
+    DIRTY_RECTS = True
+    DIRTY_RECTS_MAX = 0.5
+
+    # How many rendered text surfaces to keep
+    TEXT_CACHE_SIZE = 256
+
+    # Frame timing overlay, F3 shows it and F4 exports the kept frames
+    PROFILE = False
+    PROFILE_FRAMES = 3600
+
     MENU_FONT_SIZE = 26
     MENU_LINEFEED = 36
 
@@ -0,0 +1,134 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+
+"""
+A uniform grid over the bodies of a round, so collision checks only look
+at the bodies near a shot instead of all of them.
+
+It plugs into the physics through the index argument of collide(),
+step(), simulate() and their *_many() versions.
+"""
+
+import math
+
+import numpy
+
+from game.settings import Settings
+from game import physics
+
+
+class BodyGrid:
+    """
+    The bodies of a round, sorted into square cells.
+
+    A body goes into every cell its collision circle (the planet, or the
+    event horizon sqrt(mass) of a black hole) touches, so the cell a point
+    falls into lists every body the point could have hit. Each cell keeps
+    its bodies in their original order, which makes the first body to be
+    hit the same one a full scan would find.
+    """
+
+    def __init__(self, bodies, cell=None):
+        """
+        @param bodies: list of Bodies or Planets
+        @param cell: cell size in pixels
+        @type cell: float
+        """
+        if cell is None:
+            cell = Settings.BODY_GRID_CELL
+        self.bodies = physics.as_bodies(bodies)
+        self.arrays = physics.body_arrays(self.bodies)
+        self.cell = float(cell)
+
+        # One pixel of slack against rounding in the squared distances.
+        boxes = []
+        for b in self.bodies:
+            if b.blackhole:
+                reach = math.sqrt(b.mass) + 1
+            else:
+                reach = b.radius + 1
+            boxes.append(
+                (b.pos[0] - reach, b.pos[1] - reach, b.pos[0] + reach, b.pos[1] + reach)
+            )
+        if boxes:
+            self.origin = (min(b[0] for b in boxes), min(b[1] for b in boxes))
+            self.nx = int((max(b[2] for b in boxes) - self.origin[0]) // self.cell) + 1
+            self.ny = int((max(b[3] for b in boxes) - self.origin[1]) // self.cell) + 1
+        else:
+            self.origin = (0.0, 0.0)
+            self.nx = self.ny = 0
+
+        cells = [[] for _ in range(self.nx * self.ny)]
+        for k, (left, top, right, bottom) in enumerate(boxes):
+            i0, j0 = self.cell_of((left, top))
+            i1, j1 = self.cell_of((right, bottom))
+            for j in range(j0, j1 + 1):
+                for i in range(i0, i1 + 1):
+                    cells[j * self.nx + i].append(k)
+        self.cells = [tuple(self.bodies[k] for k in c) for c in cells]
+
+        # The same in compressed form for near_many(): the bodies of cell c
+        # are self.items[self.start[c]:self.start[c + 1]].
+        self.start = numpy.zeros(len(cells) + 1, dtype=int)
+        self.start[1:] = numpy.cumsum([len(c) for c in cells])
+        self.items = numpy.array([k for c in cells for k in c], dtype=int)
+        self.depth = max((len(c) for c in cells), default=0)
+
+    def __len__(self):
+        return len(self.bodies)
+
+    def cell_of(self, pos):
+        """The (column, row) of the cell pos falls into, not clipped."""
+        return (
+            int((pos[0] - self.origin[0]) // self.cell),
+            int((pos[1] - self.origin[1]) // self.cell),
+        )
+
+    def near(self, pos):
+        """The bodies pos could be inside of, in their original order."""
+        try:
+            i, j = self.cell_of(pos)
+        except (OverflowError, ValueError):
+            return ()
+        if 0 <= i < self.nx and 0 <= j < self.ny:
+            return self.cells[j * self.nx + i]
+        return ()
+
+    def near_many(self, pos):
+        """
+        near() for an (n, 2) array of positions.
+
+        @return: (n, k) array of body indices, padded with -1
+        """
+        with numpy.errstate(invalid="ignore"):
+            fx = numpy.floor((pos[:, 0] - self.origin[0]) / self.cell)
+            fy = numpy.floor((pos[:, 1] - self.origin[1]) / self.cell)
+            inside = (0 <= fx) & (fx < self.nx) & (0 <= fy) & (fy < self.ny)
+        c = numpy.zeros(len(pos), dtype=int)
+        c[inside] = fy[inside] * self.nx + fx[inside]
+        first = self.start[c]
+        count = numpy.where(inside, self.start[c + 1] - first, 0)
+        k = numpy.arange(self.depth)
+        valid = k[numpy.newaxis, :] < count[:, numpy.newaxis]
+        result = numpy.full((len(pos), self.depth), -1)
+        result[valid] = self.items[(first[:, numpy.newaxis] + k)[valid]]
+        return result
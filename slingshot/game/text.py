@@ -0,0 +1,119 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+
+"""
+Rendered text, kept for reuse.
+"""
+
+import re
+from collections import OrderedDict
+
+import pygame
+
+from game.settings import *
+
+# Single digits, and everything between them
+PIECES = re.compile(r"\d|\D+")
+
+
+class TextCache:
+    """
+    The last rendered text surfaces, up to size of them.
+
+    render() hands out whole lines, which suits text that repeats. A
+    counter that runs through hundreds of values would only push those
+    out again, so draw() puts its line together from glyph strips: every
+    digit on its own and the fixed text between them, each rendered once
+    per font and colour.
+    """
+
+    def __init__(self, size=None):
+        if size is None:
+            size = Settings.TEXT_CACHE_SIZE
+        self.size = size
+        self.surfaces = OrderedDict()
+        # {(font, bold, antialias, color): {piece: surface}}
+        self.strips = {}
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """Like font.render(text, antialias, color), but cached."""
+        key = (font, font.get_bold(), antialias, tuple(color), text)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self.surfaces[key] = font.render(text, antialias, color)
+        if len(self.surfaces) > self.size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def draw(self, screen, font, text, antialias, color, **anchor):
+        """
+        Draw text on screen, put together from glyph strips.
+
+        The text between digits should be fixed, each distinct piece is
+        kept for good.
+
+        @param anchor: where to put it, as a pygame.Rect attribute, e.g.
+                       topleft=(5, 5)
+        @return: the rect that was drawn to
+        """
+        style = (font, font.get_bold(), antialias, tuple(color))
+        strip = self.strips.get(style)
+        if strip is None:
+            strip = self.strips[style] = {}
+        pieces = []
+        x = 0
+        for piece in PIECES.findall(text):
+            surface = strip.get(piece)
+            if surface is None:
+                self.misses += 1
+                surface = strip[piece] = font.render(piece, antialias, color)
+            else:
+                self.hits += 1
+            pieces.append((surface, x))
+            x += surface.get_width()
+        rect = pygame.Rect(0, 0, x, font.get_height())
+        for name, value in anchor.items():
+            setattr(rect, name, value)
+        screen.blits([(surface, (rect.x + x, rect.y)) for surface, x in pieces], 0)
+        return rect
+
+    def hit_rate(self):
+        """The fraction of lookups that were found, 1 before the first one."""
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 1.0
+        return self.hits / lookups
+
+    def clear(self):
+        self.surfaces.clear()
+        self.strips.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+cache = TextCache()
@@ -0,0 +1,171 @@
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+
+"""
+The overview shown while the missile is off the screen.
+"""
+
+import pygame
+
+from game.settings import *
+
+SIZE = (600, 450)
+CENTER = (300, 225)
+
+
+class Zoom:
+    """
+    The playing area scaled down in the middle of a 600x450 view, with
+    the missile and its trail.
+
+    At level 0 the playing area is a quarter of its size, which leaves
+    room for the whole range a missile can fly in. Each further level is
+    Settings.ZOOM_STEP times closer. The view goes as close as the missile
+    allows, one level per frame, and back out as soon as it has to.
+
+    The backdrop, ships and planets are scaled once for each level, only
+    the trail and the missile are drawn as they move.
+    """
+
+    def __init__(self, background):
+        self.background = background
+        # {level: (view without missile and trail, its frames alone)}
+        self.scenes = {}
+        self.key = None
+        self.dot = None
+        self.level = 0
+        self.path = None
+        self.drawn = 0
+        self.image = None
+
+    def scale(self, level):
+        return 0.25 * Settings.ZOOM_STEP**level
+
+    def place(self, level, pos):
+        """Where pos of the playing area shows in the view."""
+        f = self.scale(level)
+        return (
+            CENTER[0] - 400 * f + pos[0] * f,
+            CENTER[1] - 300 * f + pos[1] * f,
+        )
+
+    def fit(self, pos):
+        """The closest level at which pos is inside the view."""
+        w, h = self.dot.get_size()
+        for level in range(Settings.ZOOM_LEVELS - 1, 0, -1):
+            x, y = self.place(level, pos)
+            if w <= x <= SIZE[0] - w and h <= y <= SIZE[1] - h:
+                return level
+        return 0
+
+    def area(self, level):
+        """The playing area in the view."""
+        f = self.scale(level)
+        return pygame.Rect(self.place(level, (0, 0)), (800 * f, 600 * f))
+
+    def render(self, level, sprites):
+        """
+        The view at level without missile and trail.
+
+        @return: the view, and its frames on their own to draw over the
+                 missile
+        """
+        normal_screen = pygame.Surface((800, 600))
+        normal_screen.set_colorkey((0, 0, 0))
+        normal_screen.blits([(s.image, s.rect) for s in sprites], False)
+
+        result = pygame.Surface(SIZE)
+        result.set_colorkey((0, 0, 0))
+        result.blit(self.background, (0, 0))
+        area = self.area(level)
+        result.blit(pygame.transform.scale(normal_screen, area.size), area)
+
+        frames = pygame.Surface(SIZE)
+        frames.set_colorkey((0, 0, 0))
+        for surface in (result, frames):
+            pygame.draw.rect(surface, (255, 255, 255), pygame.Rect((0, 0), SIZE), 1)
+            pygame.draw.rect(surface, (150, 150, 150), area, 1)
+        return result, frames
+
+    def draw(self, screen, pos, missile, sprites):
+        """
+        Draw the view on screen.
+
+        @param pos: where the view's top left corner goes
+        @param missile: the Missile, its path is the trail
+        @param sprites: the ships and planets to show
+        """
+        key = tuple((s.image, tuple(s.rect)) for s in sprites)
+        if key != self.key:
+            self.key = key
+            self.scenes = {}
+            self.path = None
+        if self.dot is None:
+            image = missile.get_image()
+            self.dot = pygame.transform.scale(
+                image, (image.get_size()[0] / 3, image.get_size()[1] / 3)
+            )
+
+        level = self.fit(missile.get_pos())
+        if missile.path is not self.path:
+            # A new shot
+            self.path = missile.path
+            self.level = level
+            self.image = None
+        elif level < self.level:
+            self.level = level
+            self.image = None
+        elif level > self.level:
+            self.level += 1
+            self.image = None
+
+        scene = self.scenes.get(self.level)
+        if scene is None:
+            scene = self.scenes[self.level] = self.render(self.level, sprites)
+        if self.image is None:
+            self.image = scene[0].copy()
+            self.drawn = 0
+        # Only the part of the trail flown since the last frame is new
+        points = self.path[max(self.drawn - 1, 0) :]
+        if len(points) > 1:
+            pygame.draw.aalines(
+                self.image,
+                missile.trail_color,
+                False,
+                [self.place(self.level, p) for p in points],
+            )
+        self.drawn = len(self.path)
+
+        screen.blit(self.image, pos)
+        x, y = self.place(self.level, missile.get_pos())
+        clip = screen.get_clip()
+        screen.set_clip(pygame.Rect(pos, SIZE))
+        rect = screen.blit(
+            self.dot,
+            (
+                pos[0] + x - self.dot.get_width() / 2,
+                pos[1] + y - self.dot.get_height() / 2,
+            ),
+        )
+        # The frames go over the missile
+        screen.blit(scene[1], rect, rect.move(-pos[0], -pos[1]))
+        screen.set_clip(clip)
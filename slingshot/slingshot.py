@@ -34,6 +34,7 @@
 import os
 import sys
 import threading
+import time
 from random import randint
 import pygame
 
@@ -43,8 +44,19 @@ from game.menu import *
 from game.particle import *
 from game.planet import *
 from game.player import *
+from game.profiler import *
+from game.render import *
+from game.zoom import *
 from game.general import *
+from game import ai
+from game.gravity import *
+from game.spatial import *
+from game import layout
+from game import match
 from game.settings import *
+from game import physics
+from game import text
+from game import animation
 from pygame.locals import *
 
 
@@ -69,6 +81,10 @@ class Game:
         pygame.display.init()
 
         self.clock = pygame.time.Clock()
+        self.profiler = FrameProfiler()
+        self.renderer = Renderer(self.draw_background)
+        # The "Round n" and "Game Over" banners
+        self.banner = animation.Animation()
 
         self.screen = pygame.display.set_mode((800, 600))
         icon, _ = load_image("icon64x64.png", (0, 0, 0))
@@ -92,9 +108,13 @@ class Game:
         self.trail_screen.set_colorkey((0, 0, 0))
         self.trail_screen.set_alpha(125)
 
+        # The backdrop with the planets on it, see draw_planets()
         self.planet_screen = pygame.Surface(self.screen.get_size())
-        self.planet_screen = self.trail_screen.convert()
-        self.planet_screen.set_colorkey((0, 0, 0))
+        self.planet_screen = self.planet_screen.convert()
+        self.planet_key = None
+        # planet_screen with trail_screen blended over it, see blend_trail()
+        self.scene_screen = pygame.Surface(self.screen.get_size())
+        self.scene_screen = self.scene_screen.convert()
 
         self.dim_screen = pygame.Surface(self.screen.get_size())
         self.dim_screen.set_alpha(175)
@@ -102,6 +122,7 @@ class Game:
         # self.dim_screen.fill((0,0,0))
 
         self.background, _ = load_image("backdrop.png")
+        self.zoom = Zoom(self.background)
 
         self.players = (Dummy(), Player(1), Player(2))
         self.playersprites = pygame.sprite.RenderPlain(
@@ -113,6 +134,9 @@ class Game:
         self.net_client = False
         self.net_host = False
 
+        # Level of the computer playing player 2, None for a human
+        self.opponent = None
+
         self.load_settings()
 
         if self.fullscreen:
@@ -182,6 +206,14 @@ class Game:
         self.mode_menu.add("Max number of black holes")
         self.mode_menu.add("Number of rounds")
         self.mode_menu.add("Shot timeout")
+        self.mode_menu.add("Opponent")
+
+        self.opponent_menu = Menu("Opponent")
+        self.opponent_menu.add("Back")
+        self.opponent_menu.add("Human")
+        self.opponent_menu.add("Computer (easy)")
+        self.opponent_menu.add("Computer (medium)")
+        self.opponent_menu.add("Computer (hard)")
 
         self.timeout_menu = Numeric("Shot timeout", self.timeout, 250, 2000, 500)
 
@@ -253,6 +285,8 @@ class Game:
             result = True
             if Settings.FULLSCREEN != self.fullscreen:
                 result = True
+        if self.players[2].level != self.opponent:
+            result = True
 
         return result
 
@@ -265,6 +299,8 @@ class Game:
         Settings.RANDOM = self.random
         Settings.MAX_FLIGHT = self.timeout
         Settings.MAX_BLACKHOLES = self.max_blackholes
+        if self.players[2].level != self.opponent:
+            self.set_opponent(self.opponent)
 
         # is there an old network game but the new is none
         if self.net_play() and not net_client and not net_host:
@@ -311,9 +347,13 @@ class Game:
         self.missile.flight = 0
 
         self.firing = 0
-        self.particlesystem = pygame.sprite.RenderPlain()
+        self.particlesystem = ParticleSystem()
 
         self.planetsprites = self.create_planets(planetlist)
+        self.bodies = physics.as_bodies(self.planetsprites)
+        self.body_arrays = physics.body_arrays(self.bodies)
+        self.body_grid = BodyGrid(self.bodies)
+        self.gravity_field = field_for(self.bodies)
 
         self.trail_screen.fill((0, 0, 0))
 
@@ -327,15 +367,33 @@ class Game:
         if self.net_play() and not self.active_net_player():
             threading.Thread(self.thread_job, ())
 
-        self.show_round = 100
+        self.banner.play(animation.banner(f"Round {self.round}", 25))
         if Settings.INVISIBLE:
             self.show_planets = 100
         else:
             self.show_planets = 0
+        self.draw_planets()
 
         if self.net_host:
             self.host_round_init()
 
+    def export_profile(self):
+        """
+        Write the kept frame timings to ~/.slingshot/frames-<time>.csv/json.
+
+        The profiler overlay is shown and names the files until the next
+        export.
+
+        @return: the names of both files
+        """
+        path = os.path.expanduser("~") + "/.slingshot"
+        if not os.path.exists(path):
+            os.mkdir(path)
+        path += time.strftime("/frames-%Y%m%d-%H%M%S")
+        if not self.profiler.visible:
+            self.profiler.toggle()
+        return self.profiler.export(path)
+
     def toggle_menu(self):
         if self.menu is None:
             self.menu = self.main_menu
@@ -380,26 +438,20 @@ class Game:
     def create_particlesystem(self, pos, n, size):
         if Settings.PARTICLES:
             if Settings.BOUNCE:
-                nn = n / 2
+                nn = n // 2
             else:
                 nn = n
-        # for i in range(nn):
-        # self.particlesystem.add(Particle(pos, size))
+            self.particlesystem.add(pos, nn, size)
 
     def create_planets(self, planetlist=None):
         result = pygame.sprite.RenderPlain()
 
         if planetlist is None:
-            if Settings.MAX_BLACKHOLES > 0:
-                n = randint(1, Settings.MAX_BLACKHOLES)
-                for _ in range(n):
-                    result.add(Blackhole(result, self.background))
-            else:
-                # Only have planets if we don't have any
-                # blackholes.
-                n = randint(2, Settings.MAX_PLANETS)
-                for _ in range(n):
-                    result.add(Planet(result, self.background))
+            for n, radius, mass, pos, blackhole in layout.generate_round():
+                if blackhole:
+                    result.add(Blackhole(None, self.background, n, radius, mass, pos))
+                else:
+                    result.add(Planet(None, self.background, n, radius, mass, pos))
         else:
             for p in planetlist:
                 if p[0] > Settings.MAX_PLANETS:
@@ -410,117 +462,134 @@ class Game:
                     result.add(Planet(None, self.background, p[0], p[1], p[2], p[3]))
         return result
 
+    def set_opponent(self, level):
+        """Let the computer play player 2 at level, or a human for None."""
+        if level is None:
+            player = Player(2)
+        else:
+            player = AIPlayer(2, level)
+        self.players = (self.players[0], self.players[1], player)
+        self.playersprites = pygame.sprite.RenderPlain(
+            (self.players[1], self.players[2])
+        )
+
+    def computer_turn(self):
+        return isinstance(self.players[self.player], AIPlayer) and not self.net_play()
+
     def change_angle(self, a):
-        self.players[self.player].change_angle(a)
+        if not self.computer_turn():
+            self.players[self.player].change_angle(a)
 
     def change_power(self, p):
-        self.players[self.player].change_power(p)
+        if not self.computer_turn():
+            self.players[self.player].change_power(p)
 
     def fire(self):
         if self.round_over:
             self.round_init()
-        elif not self.firing:
-            self.missile.launch(self.players[self.player])
-            self.players[self.player].attempts += 1
-            self.last = self.player
-            self.player = 0
-            self.firing = 1
-            pygame.key.set_repeat()
-
-    def draw_zoom(self):
-        normal_screen = pygame.Surface((800, 600))
-        normal_screen.set_colorkey((0, 0, 0))
-        normal_screen.convert_alpha()
-        self.playersprites.draw(normal_screen)
+        elif not self.firing and not self.computer_turn():
+            self.launch()
+
+    def launch(self):
+        self.missile.launch(self.players[self.player])
+        self.players[self.player].attempts += 1
+        self.last = self.player
+        self.player = 0
+        self.firing = 1
+        pygame.key.set_repeat()
+
+    def draw_zoom(self, screen):
+        screen.blit(self.dim_screen, (0, 0))
+        sprites = list(self.playersprites)
         if not Settings.INVISIBLE:
-            self.planetsprites.draw(normal_screen)
-
-        zoom_screen = pygame.Surface((600, 450))
-        zoom_screen.set_colorkey((0, 0, 0))
-        zoom_screen.convert_alpha()
-
-        background = pygame.transform.scale(self.background, (600, 450))
-        zoom_screen.blit(self.background, (0, 0))
-        normal_screen = pygame.transform.scale(normal_screen, (200, 150))
-        zoom_screen.blit(normal_screen, (200, 150))
-
-        missilesprite = self.missile.get_image()
-        missilesprite = pygame.transform.scale(
-            missilesprite,
-            (missilesprite.get_size()[0] / 3, missilesprite.get_size()[1] / 3),
-        )
-        pos = self.missile.get_pos()
-        pos = (
-            200 + pos[0] / 4 - missilesprite.get_width() / 2,
-            150 + pos[1] / 4 - missilesprite.get_height() / 2,
+            sprites += list(self.planetsprites)
+        self.zoom.draw(screen, (100, 75), self.missile, sprites)
+
+    def draw_planets(self):
+        """
+        Put the backdrop and the visible planets on planet_screen, unless
+        they are there already.
+        """
+        fading = Settings.INVISIBLE and self.round_over and self.show_planets > 0
+        key = (
+            self.planetsprites,
+            fading and self.show_planets,
+            Settings.INVISIBLE and not self.round_over,
         )
-        zoom_screen.blit(missilesprite, pos)
+        if key == self.planet_key:
+            return
+        self.planet_key = key
+        self.planet_screen.blit(self.background, (0, 0))
+        if not Settings.INVISIBLE or self.round_over:
+            self.planetsprites.draw(self.planet_screen)
+        self.blend_trail(self.planet_screen.get_rect())
+
+    def blend_trail(self, rect):
+        """
+        Bring scene_screen up to date within rect, after the trail or the
+        planets changed there.
+
+        The trail is blended in once, so drawing the scene costs a plain
+        blit instead of blending all of trail_screen every frame.
+        """
+        rect = rect.clip(self.scene_screen.get_rect())
+        self.scene_screen.blit(self.planet_screen, rect, rect)
+        self.scene_screen.blit(self.trail_screen, rect, rect)
+
+    def draw_background(self, surface):
+        """The planets on the backdrop and the trail: all that does not move."""
+        surface.blit(self.scene_screen, (0, 0))
 
-        pygame.draw.rect(zoom_screen, (255, 255, 255), pygame.Rect(0, 0, 600, 450), 1)
-        pygame.draw.rect(
-            zoom_screen, (150, 150, 150), pygame.Rect(200, 150, 200, 150), 1
-        )
-        self.screen.blit(self.dim_screen, (0, 0))
-        self.screen.blit(zoom_screen, (100, 75))
+        if Settings.BOUNCE:
+            # Planets keep their distance from the edges, the border does
+            # not need to go under them. The trail goes over it.
+            bounds = pygame.Rect(0, 0, 800, 600)
+            pygame.draw.rect(surface, (self.bounce_count, 0, 0), bounds, 1)
+            for edge in border(bounds):
+                surface.blit(self.trail_screen, edge, edge)
 
     def draw(self):
-        self.screen.blit(self.background, (0, 0))
-
+        fading = Settings.INVISIBLE and self.round_over and self.show_planets > 0
+        if fading:
+            for p in self.planetsprites:
+                p.fade(self.show_planets)
+        self.draw_planets()
         if Settings.BOUNCE:
-            pygame.draw.rect(
-                self.screen, (self.bounce_count, 0, 0), pygame.Rect(0, 0, 800, 600), 1
-            )
-
-        show_planets = False
-        if not Settings.INVISIBLE:
-            show_planets = True
-        else:
-            if self.round_over:
-                if self.show_planets > 0:
-                    for p in self.planetsprites:
-                        p.fade(self.show_planets)
-                    self.planetsprites.draw(self.screen)
-                    self.show_planets -= 1
-                else:
-                    show_planets = True
-        if show_planets:
-            self.planetsprites.draw(self.screen)
-        self.screen.blit(self.trail_screen, (0, 0))
-        self.playersprites.draw(self.screen)
+            # The border changes colour every frame.
+            for edge in border(pygame.Rect(0, 0, 800, 600)):
+                self.renderer.refresh(edge)
+        screen = self.renderer.begin(
+            self.screen,
+            (self.planet_key, Settings.BOUNCE),
+            (self.players[1], self.players[2]),
+        )
+        if fading:
+            self.show_planets -= 1
+        self.profiler.lap("draw.background")
         # self.players[1].draw(self.screen)
         # self.players[2].draw(self.screen)
         # print(self.particlesystem)
         if Settings.PARTICLES:
-            self.particlesystem.draw(self.screen)
+            self.particlesystem.draw(screen)
+        self.profiler.lap("draw.particles")
         if self.firing:
             if self.missile.visible():
-                self.missilesprite.draw(self.screen)
+                self.missilesprite.draw(screen)
+        self.profiler.lap("draw.missile")
         # print(self.planetsprites)
         if self.firing:
             if not self.missile.visible():
-                self.draw_zoom()
-        self.players[1].draw_status(self.screen)
-        self.players[2].draw_status(self.screen)
+                self.draw_zoom(screen)
+        self.profiler.lap("draw.zoom")
+        self.players[1].draw_status(screen)
+        self.players[2].draw_status(screen)
+        self.profiler.lap("draw.status")
         if not self.round_over:
-            self.players[self.player].draw_info(self.screen)
-            self.players[self.player].draw_line(self.screen)
+            self.players[self.player].draw_info(screen)
+            screen.mark(self.players[self.player].draw_line(self.screen))
         else:
-            if self.show_round > 30:
-                txt = Settings.round_font.render("Game Over", 1, (255, 255, 255))
-                tmp = pygame.Surface(txt.get_size())
-                tmp = tmp.convert_alpha()
-                tmp.blit(txt, (0, 0))
-                tmp = tmp.convert()
-                tmp.set_alpha(2 * self.show_round - 60)
-                tmp.set_colorkey((0, 0, 0))
-                tmp = tmp.convert_alpha()
-                rect = tmp.get_rect()
-                s = (100 - self.show_round) * rect.h / 15
-                tmp = pygame.transform.scale(tmp, (int(rect.w / rect.h * s), int(s)))
-                rect = tmp.get_rect()
-                rect.center = (399, 299)
-                self.screen.blit(tmp, rect.topleft)
-                self.show_round /= 1.04
+            if self.banner.playing():
+                screen.blit(*self.banner.next())
             elif self.show_planets <= 0:
                 dim = pygame.Surface(self.end_round_msg.get_size())
                 dim.set_alpha(175)
@@ -529,68 +598,54 @@ class Game:
                 rect = self.end_round_msg.get_rect()
                 rect.center = (399, 299)
 
-                self.screen.blit(dim, rect.topleft)
-                self.screen.blit(self.end_round_msg, rect.topleft)
+                screen.blit(dim, rect.topleft)
+                screen.blit(self.end_round_msg, rect.topleft)
+        self.profiler.lap("draw.info")
 
         if self.firing:
-            self.missile.draw_status(self.screen)
+            self.missile.draw_status(screen)
         elif self.started:
             if Settings.MAX_ROUNDS > 0:
-                txt = Settings.font.render(
+                txt = text.cache.render(
+                    Settings.font,
                     f"Round {self.round} of {Settings.MAX_ROUNDS}",
                     1,
                     (255, 255, 255),
                 )
             else:
-                txt = Settings.font.render(f"Round {self.round}", 1, (255, 255, 255))
+                txt = text.cache.render(
+                    Settings.font, f"Round {self.round}", 1, (255, 255, 255)
+                )
             rect = txt.get_rect()
             rect.midbottom = (399, 594)
-            self.screen.blit(txt, rect.topleft)
+            screen.blit(txt, rect.topleft)
+        self.profiler.lap("draw.round")
 
         if self.started and not self.game_over:
-            if self.show_round > 30:
-                txt = Settings.round_font.render(
-                    f"Round {self.round}", 1, (255, 255, 255)
-                )
-                tmp = pygame.Surface(txt.get_size())
-                tmp = tmp.convert_alpha()
-                tmp.blit(txt, (0, 0))
-                tmp = tmp.convert()
-                tmp.set_alpha(2 * self.show_round - 60)
-                tmp.set_colorkey((0, 0, 0))
-                tmp = tmp.convert_alpha()
-                rect = tmp.get_rect()
-                s = (100 - self.show_round) * rect.h / 25
-                tmp = pygame.transform.scale(tmp, (int(rect.w / rect.h * s), int(s)))
-                rect = tmp.get_rect()
-                rect.center = (399, 299)
-                self.screen.blit(tmp, rect.topleft)
-                self.show_round /= 1.04
+            if self.banner.playing():
+                screen.blit(*self.banner.next())
+        self.profiler.lap("draw.banner")
 
         if self.menu is not None:
             if self.menu.dim:
-                self.screen.blit(self.dim_screen, (0, 0))
+                screen.blit(self.dim_screen, (0, 0))
             img = self.menu.draw()
             rect = img.get_rect()
             rect.center = (399, 299)
-            self.screen.blit(img, rect.topleft)
+            screen.blit(img, rect.topleft)
+        self.profiler.lap("draw.menu")
 
-        pygame.display.flip()
+        self.profiler.draw(screen)
+        self.profiler.lap("draw.profiler")
+
+        self.profiler.count("pixels", self.renderer.present())
+        self.profiler.lap("display.flip")
 
     def update_particles(self):
         if Settings.PARTICLES:
-            for p in self.particlesystem:
-                # print(p.get_pos())
-                if p.update(self.planetsprites) == 0 or p.flight < 0:
-                    if p.flight >= 0 and p.in_range():
-                        if p.get_size() == 10:
-                            self.create_particlesystem(
-                                p.get_impact_pos(), Settings.n_PARTICLES_5, 5
-                            )
-                    # print("removing: ", p.get_pos())
-                    self.particlesystem.remove(p)
-                if p.flight > Settings.MAX_FLIGHT:
-                    self.particlesystem.remove(p)
+            self.particlesystem.update(
+                self.body_arrays, self.gravity_field, self.body_grid
+            )
 
     def end_shot(self):
         pygame.event.clear()
@@ -624,6 +679,13 @@ class Game:
             if c == "Off":
                 Settings.PARTICLES = False
                 self.toggle_menu()
+        if self.menu == self.opponent_menu:
+            if c == "Human":
+                self.opponent = None
+                self.toggle_menu()
+            elif c.startswith("Computer"):
+                self.opponent = c[len("Computer (") : -1]
+                self.toggle_menu()
         if self.menu == self.fullscreen_menu:
             if c == "On":
                 self.fullscreen = True
@@ -678,6 +740,7 @@ class Game:
         elif c == "Connect to a host":
             in_box = Inputbox(self.screen, "Hostname")
             hostname = in_box.ask()
+            self.renderer.invalidate()
             if hostname is not False:
                 self.client_game_init(hostname)
         elif c == "Game options":
@@ -700,12 +763,28 @@ class Game:
             self.menu = self.particles_menu
         elif c == "Full Screen":
             self.menu = self.fullscreen_menu
-
-    def update(self):
-        self.update_particles()
-        if self.firing:
-            self.firing = self.missile.update(self.planetsprites, self.players)
-        if self.missile.flight < 0 and not self.missile.visible():
+        elif c == "Opponent":
+            self.menu = self.opponent_menu
+
+    def fast_forward(self):
+        """
+        Number of ticks to simulate this frame.
+
+        While the missile is off screen, or the player holds Tab, we run
+        Settings.FAST_FORWARD ticks per frame. Every tick is the same as
+        at normal speed, only fewer of them get drawn.
+        """
+        if not self.firing or self.menu is not None:
+            return 1
+        if not self.missile.visible() or pygame.key.get_pressed()[K_TAB]:
+            return max(1, Settings.FAST_FORWARD)
+        return 1
+
+    def update_missile(self):
+        self.firing = self.missile.update(
+            self.bodies, self.players, self.gravity_field, self.body_grid
+        )
+        if self.missile.flight < 0 and not physics.visible(self.missile.get_pos()):
             self.firing = 0
         if self.firing <= 0:
             # Collision between missile and planet (0) or
@@ -713,17 +792,52 @@ class Game:
             #
             # Don't create any particles when we hit a black
             # hole, the missile got sucked up.
-            if self.firing == 0 and self.missile.visible():
+            if self.firing == 0 and physics.visible(self.missile.get_pos()):
                 self.create_particlesystem(
                     self.missile.get_impact_pos(), Settings.n_PARTICLES_10, 10
                 )
-                self.end_shot()
+            self.end_shot()
+
+    def update_computer(self):
+        """Let the computer take its shot once it has made up its mind."""
+        if self.firing or self.round_over or self.menu is not None:
+            return
+        player = self.players[self.player]
+        aim = player.think(
+            self.body_arrays,
+            (self.players[1].get_ship(), self.players[2].get_ship()),
+            field=self.gravity_field,
+            index=self.body_grid,
+        )
+        if aim is not None:
+            player.change_angle(aim.angle - player.get_angle())
+            player.change_power(aim.power - player.get_power())
+            self.launch()
+
+    def update(self):
+        for _ in range(self.fast_forward()):
+            self.update_particles()
+            self.profiler.lap("update_particles")
+            if not self.firing:
+                break
+            self.update_missile()
+            self.profiler.lap("missile.update")
+        # All ticks of this frame go onto the trail in one go.
+        rect = self.missile.draw_trail()
+        if rect is not None:
+            self.blend_trail(rect)
+            self.renderer.refresh(rect)
+        self.profiler.lap("missile.draw_trail")
+        if self.computer_turn():
+            self.update_computer()
+            self.profiler.lap("update_computer")
 
         if self.net_play() and not self.active_net_player():
             threading.start_new_thread(self.thread_job, ())
 
         if self.menu is not None:
             self.menu_action()
+            self.profiler.lap("menu_action")
         if self.players[1].shot or self.players[2].shot:
             if self.players[1].shot:
                 self.players[1].update_explosion()
@@ -739,6 +853,7 @@ class Game:
         if self.bounce_count > 255 or self.bounce_count < 125:
             self.bounce_count_inc *= -1
             self.bounce_count += 2 * self.bounce_count_inc
+        self.profiler.lap("update")
 
     def end_round(self):
         self.round_over = True
@@ -759,14 +874,7 @@ class Game:
                     killed_self = True
                 else:
                     message = f"Player {3 - i} killed player {i}"
-                    if self.players[3 - i].attempts == 1:
-                        bonus = Settings.QUICKSCORE1
-                    elif self.players[3 - i].attempts == 2:
-                        bonus = Settings.QUICKSCORE2
-                    elif self.players[3 - i].attempts == 3:
-                        bonus = Settings.QUICKSCORE3
-                    else:
-                        bonus = 0
+                    bonus = match.quick_bonus(self.players[3 - i].attempts)
                     killed_self = False
                     score = power_penalty + bonus + Settings.HITSCORE
                     score_message = "{score} added to score"
@@ -846,7 +954,7 @@ class Game:
                 self.end_round_msg.blit(msg, rect.topleft)
 
                 if self.round == Settings.MAX_ROUNDS:
-                    self.show_round = 100
+                    self.banner.play(animation.banner("Game Over", 15))
                     self.game_over = True
                     if self.players[1].score > self.players[2].score:
                         winner = 1
@@ -893,8 +1001,9 @@ class Game:
 
     def run(self):
         while not self.q:
+            self.profiler.frame()
             self.clock.tick(Settings.FPS)
-            # print(self.clock.get_fps())
+            self.profiler.lap(IDLE)
 
             for event in self.event_check():
                 if event.type == QUIT:
@@ -902,6 +1011,10 @@ class Game:
                 elif event.type == KEYDOWN:
                     if event.key == K_ESCAPE:
                         self.toggle_menu()
+                    elif event.key == K_F3:
+                        self.profiler.toggle()
+                    elif event.key == K_F4:
+                        self.export_profile()
 
                     if self.menu is None and (
                         not self.net_play() or self.active_net_player()
@@ -989,6 +1102,7 @@ class Game:
                             self.menu.right()
                         elif event.key == K_RETURN or event.key == K_SPACE:
                             self.menu.select()
+            self.profiler.lap("event_check")
 
             self.lock.acquire()
             self.update()
@@ -1042,6 +1156,9 @@ class Game:
                     self.timeout = int(tokens[1])
                 elif tokens[0] == "Rounds:":
                     self.max_rounds = int(tokens[1])
+                elif tokens[0] == "Opponent:":
+                    if tokens[1] in ai.LEVELS:
+                        self.opponent = tokens[1]
             f.close()
 
     def save_settings(self):
@@ -1079,6 +1196,7 @@ class Game:
         f.write(f"Max_Blackholes: {self.max_blackholes}\n")
         f.write(f"Timeout: {self.timeout}\n")
         f.write(f"Rounds: {self.max_rounds}\n")
+        f.write(f"Opponent: {self.opponent or 'human'}\n")
         f.close()
 
     def net_play(self):
@@ -1194,16 +1312,7 @@ class Game:
             self.net.close()
 
     def host_round_init(self):
-        planetlist = []
-        for planet in self.planetsprites:
-            planetlist.append(
-                (
-                    planet.get_n(),
-                    planet.get_radius(),
-                    planet.get_mass(),
-                    planet.get_pos(),
-                )
-            )
+        planetlist = physics.serialize_layout(self.planetsprites)
 
         y_coordlist = (
             self.players[1].get_rect_y_coord(),
@@ -1224,9 +1333,11 @@ class Game:
 
     def use_fullscreen(self):
         pygame.display.set_mode((0, 0), FULLSCREEN | NOFRAME)
+        self.renderer.invalidate()
 
     def use_window(self):
         pygame.display.set_mode((800, 600))
+        self.renderer.invalidate()
 
 
 def main():
@@ -0,0 +1,209 @@
+#! /usr/bin/python
+#    This file is part of Slingshot.
+#
+# Slingshot is a two-dimensional strategy game where two players attempt to shoot one
+# another through a section of space populated by planets.  The main feature of the
+# game is that the shots, once fired, are affected by the gravity of the planets.
+
+# Slingshot is Copyright 2007 Jonathan Musther and Bart Mak. It is released under the
+# terms of the GNU General Public License version 2, or later if applicable.
+
+# Slingshot is free software; you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation; either
+# version 2 of the License, or any later version.
+
+# Slingshot is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with Slingshot;
+# if not, write to
+# the Free Software Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+
+"""
+Play computer players against each other without a window.
+
+Runs many game.match.Matches across a process pool and reports who won,
+how the rounds went and how many rounds per second each core managed:
+
+    python tournament.py --matches 1000 --levels easy,medium
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+from game.settings import Settings
+from game import ai
+from game import match
+
+
+def configure(overrides):
+    """Apply the Settings given on the command line in a worker."""
+    for name, value in overrides.items():
+        setattr(Settings, name, value)
+
+
+def play(job):
+    """Play one match in a worker, job is (seed, level 1, level 2, rounds)."""
+    seed, level1, level2, rounds = job
+    random.seed(seed)
+    start = time.process_time()
+    game = match.Match(match.ai_shooter(level1), match.ai_shooter(level2))
+    results = game.play(rounds)
+    return {
+        "seed": seed,
+        "levels": (level1, level2),
+        "rounds": [r._asdict() for r in results],
+        "score": game.score[1:],
+        "cpu": time.process_time() - start,
+    }
+
+
+def summarize(matches, wall, processes):
+    """Aggregate match results by pairing, plus throughput figures."""
+    pairings = {}
+    for m in matches:
+        key = "{} vs {}".format(*m["levels"])
+        p = pairings.setdefault(
+            key,
+            {
+                "matches": 0,
+                "wins": [0, 0],
+                "draws": 0,
+                "rounds": 0,
+                "round_wins": [0, 0],
+                "round_draws": 0,
+                "self_hits": 0,
+                "shots": 0,
+                "score": [0.0, 0.0],
+            },
+        )
+        p["matches"] += 1
+        score1, score2 = m["score"]
+        if score1 > score2:
+            p["wins"][0] += 1
+        elif score2 > score1:
+            p["wins"][1] += 1
+        else:
+            p["draws"] += 1
+        p["score"][0] += score1
+        p["score"][1] += score2
+        for r in m["rounds"]:
+            p["rounds"] += 1
+            p["shots"] += r["shots"]
+            p["self_hits"] += r["self_hit"]
+            if r["winner"]:
+                p["round_wins"][r["winner"] - 1] += 1
+            else:
+                p["round_draws"] += 1
+    for p in pairings.values():
+        p["shots_per_round"] = p["shots"] / p["rounds"]
+        p["score"] = [s / p["matches"] for s in p["score"]]
+
+    rounds = sum(len(m["rounds"]) for m in matches)
+    cpu = sum(m["cpu"] for m in matches)
+    return {
+        "pairings": pairings,
+        "throughput": {
+            "matches": len(matches),
+            "rounds": rounds,
+            "processes": processes,
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "rounds_per_second": rounds / wall,
+            "rounds_per_second_per_core": rounds / wall / processes,
+            "rounds_per_cpu_second": rounds / cpu if cpu else 0.0,
+        },
+    }
+
+
+def report(stats, out=sys.stdout):
+    print(
+        f"{'pairing':<20} {'matches':>7} {'wins':>11} {'rounds':>7}"
+        f" {'round wins':>11} {'draws':>6} {'self hits':>9} {'shots':>6}"
+        f" {'mean score':>17}",
+        file=out,
+    )
+    for key, p in sorted(stats["pairings"].items()):
+        wins = "{} / {}".format(*p["wins"])
+        round_wins = "{} / {}".format(*p["round_wins"])
+        score = "{:.0f} / {:.0f}".format(*p["score"])
+        print(
+            f"{key:<20} {p['matches']:>7} {wins:>11} {p['rounds']:>7}"
+            f" {round_wins:>11} {p['round_draws']:>6} {p['self_hits']:>9}"
+            f" {p['shots_per_round']:>6.2f} {score:>17}",
+            file=out,
+        )
+    t = stats["throughput"]
+    print(
+        f"\n{t['rounds']} rounds in {t['wall_seconds']:.1f}s on"
+        f" {t['processes']} processes: {t['rounds_per_second']:.2f} rounds/s,"
+        f" {t['rounds_per_second_per_core']:.2f} rounds/s per core,"
+        f" {t['rounds_per_cpu_second']:.2f} rounds per CPU second",
+        file=out,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--matches", type=int, default=100)
+    parser.add_argument("-r", "--rounds", type=int, default=5, help="per match")
+    parser.add_argument(
+        "-l",
+        "--levels",
+        default="easy,medium",
+        help="comma separated computer levels, every ordered pair plays",
+    )
+    parser.add_argument(
+        "-p", "--processes", type=int, default=os.cpu_count(), help="worker count"
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("--planets", type=int, default=Settings.MAX_PLANETS)
+    parser.add_argument("--blackholes", type=int, default=Settings.MAX_BLACKHOLES)
+    parser.add_argument("--timeout", type=int, default=Settings.MAX_FLIGHT)
+    parser.add_argument("--bounce", action="store_true")
+    parser.add_argument("--fixed-power", action="store_true")
+    parser.add_argument("-o", "--output", help="write the statistics as JSON here")
+    args = parser.parse_args(argv)
+
+    levels = args.levels.split(",")
+    for level in levels:
+        if level not in ai.LEVELS:
+            parser.error(f"unknown level {level}, choose from {', '.join(ai.LEVELS)}")
+    overrides = {
+        "MAX_PLANETS": args.planets,
+        "MAX_BLACKHOLES": args.blackholes,
+        "MAX_FLIGHT": args.timeout,
+        "BOUNCE": args.bounce,
+        "FIXED_POWER": args.fixed_power,
+    }
+    pairings = list(itertools.product(levels, repeat=2))
+    jobs = [
+        (args.seed + i, *pairings[i % len(pairings)], args.rounds)
+        for i in range(args.matches)
+    ]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        args.processes, initializer=configure, initargs=(overrides,)
+    ) as pool:
+        chunk = max(1, len(jobs) // (4 * args.processes))
+        matches = list(pool.map(play, jobs, chunksize=chunk))
+    stats = summarize(matches, time.perf_counter() - start, args.processes)
+    stats["settings"] = overrides
+
+    report(stats)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(stats, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()